@@ -102,6 +102,9 @@ class CoreIndexer:
         
         # Initialize parser registry with shared config manager
         self.parser_registry = ParserRegistry(project_path, self.project_config_manager)
+        
+        # Parsed state files keyed by path -> (inode, mtime_ns, size) signature
+        self._state_cache: Dict[Path, Tuple[Tuple[int, int, int], Dict[str, Dict[str, Any]]]] = {}
     
     def _create_batch_callback(self, collection_name: str):
         """Create a callback function for batch processing during streaming."""
@@ -230,9 +233,13 @@ class CoreIndexer:
                 
                 # Handle deleted files using consolidated function
                 if deleted_files:
-                    self._handle_deleted_files(collection_name, deleted_files, verbose)
-                    # State cleanup happens automatically in _update_state when no files_to_process
-                    result.warnings.append(f"Handled {len(deleted_files)} deleted files")
+                    if self._handle_deleted_files(collection_name, deleted_files, verbose):
+                        # State cleanup happens automatically in _update_state when no files_to_process
+                        result.warnings.append(f"Handled {len(deleted_files)} deleted files")
+                    else:
+                        # Keep their state entries so the next incremental run retries the cleanup
+                        result.warnings.append(f"Failed to remove entities for {len(deleted_files)} deleted files; will retry")
+                        deleted_files = []
             else:
                 files_to_process = self._find_all_files(include_tests)
                 deleted_files = []
@@ -316,6 +323,10 @@ class CoreIndexer:
                 if not storage_success:
                     result.success = False
                     result.errors.append("Failed to store vectors in Qdrant")
+                    # Nothing from this run is in Qdrant, so keep these files out of
+                    # the state file and let the next run retry them
+                    result.failed_files.extend(str(f) for f in successfully_processed)
+                    successfully_processed = []
                 else:
                     result.entities_created = len(all_entities)
                     result.relations_created = len(all_relations)
@@ -343,6 +354,9 @@ class CoreIndexer:
                     logger.info(f"   Incremental: {incremental}")
                     logger.info(f"   Successfully processed: {len(successfully_processed) if successfully_processed else 0}")
                     logger.info(f"   Reason: No files processed")
+            elif incremental and deleted_files:
+                # Deletions were already cleaned up above; record them even though nothing was stored
+                self._update_state([], collection_name, verbose, full_rebuild=False, deleted_files=deleted_files)
             elif verbose:
                 logger.warning(f"⚠️  No files to save state for (all {len(files_to_process)} files failed)")
             
@@ -393,18 +407,9 @@ class CoreIndexer:
                 logger.info(f"🧹 DEBUG: Collection '{collection_name}' exists: {collection_exists}")
                 
                 if collection_exists:
-                    # Try to find entities before deletion
-                    full_path = str(file_path)
-                    logger.info(f"🧹 DEBUG: Searching for entities with path: {full_path}")
-                    found_entities = self.vector_store.find_entities_for_file(collection_name, full_path)
-                    logger.info(f"🧹 DEBUG: Found {len(found_entities)} entities before cleanup")
-                    
-                    # Run cleanup
+                    # One filter-based delete; it logs how many entities it removed,
+                    # so no extra scrolls are needed to report before/after counts
                     self._handle_deleted_files(collection_name, relative_path, verbose=True)
-                    
-                    # Check after cleanup
-                    found_entities_after = self.vector_store.find_entities_for_file(collection_name, full_path)
-                    logger.info(f"🧹 DEBUG: Found {len(found_entities_after)} entities after cleanup")
                 else:
                     logger.info(f"🧹 DEBUG: Collection doesn't exist, skipping cleanup")
                     
@@ -632,60 +637,71 @@ class CoreIndexer:
         """Get files that need processing for incremental indexing."""
         return self._find_changed_files(include_tests, collection_name)[0]
     
-    def _find_changed_files(self, include_tests: bool = False, collection_name: str = None) -> Tuple[List[Path], List[str]]:
-        """Find files that have changed since last indexing."""
+    def _diff_file_states(self, include_tests: bool = False, collection_name: str = None) -> Tuple[List[Path], List[Path], List[str]]:
+        """Compare current file hashes with the saved state.
+        
+        Returns (changed_files, new_files, deleted_files). changed_files keeps
+        discovery order and includes the new files; deleted_files are the
+        relative paths that are in the saved state but no longer on disk.
+        
+        A file whose size and mtime still match its saved entry keeps the saved
+        hash without being read. As in git's racy-clean check, that shortcut is
+        only trusted for mtimes strictly older than the state file itself, so an
+        edit landing in the same timestamp tick as the last save is still hashed.
+        """
         current_files = self._find_all_files(include_tests)
-        current_state = self._get_current_state(current_files)
         previous_state = self._load_state(collection_name)
+        try:
+            state_mtime = self._get_state_file(collection_name).stat().st_mtime
+        except OSError:
+            state_mtime = 0.0
         
-        changed_files = []
-        deleted_files = []
+        # Flatten the saved state to key -> hash once, dropping metadata entries
+        previous_hashes = {
+            key: entry.get("hash", "")
+            for key, entry in previous_state.items()
+            if not key.startswith('_')
+        }
         
-        # Find new and modified files
+        current_keys = set()
+        changed_files = []
+        new_files = []
         for file_path in current_files:
-            file_key = str(file_path.relative_to(self.project_path))
-            current_hash = current_state.get(file_key, {}).get("hash", "")
-            previous_hash = previous_state.get(file_key, {}).get("hash", "")
+            try:
+                file_key = str(file_path.relative_to(self.project_path))
+                stat = file_path.stat()
+            except (OSError, ValueError):
+                continue
+            current_keys.add(file_key)
+            previous_hash = previous_hashes.get(file_key, "")
+            
+            entry = previous_state[file_key] if previous_hash else None
+            if (entry is not None
+                    and entry.get("size") == stat.st_size
+                    and entry.get("mtime") == stat.st_mtime
+                    and stat.st_mtime < state_mtime):
+                continue  # Unchanged since the last save; skip reading it
             
-            if current_hash != previous_hash:
+            if self._get_file_hash(file_path) != previous_hash:
                 changed_files.append(file_path)
+                if previous_hash == "":  # Not in previous state = new file
+                    new_files.append(file_path)
         
-        # Find deleted files
-        current_keys = set(current_state.keys())
-        previous_keys = set(previous_state.keys())
-        deleted_keys = previous_keys - current_keys
-        deleted_files.extend(deleted_keys)
+        # Find deleted files with a single set difference on the keys
+        deleted_files = list(previous_hashes.keys() - current_keys)
         
+        return changed_files, new_files, deleted_files
+    
+    def _find_changed_files(self, include_tests: bool = False, collection_name: str = None) -> Tuple[List[Path], List[str]]:
+        """Find files that have changed since last indexing."""
+        changed_files, _, deleted_files = self._diff_file_states(include_tests, collection_name)
         return changed_files, deleted_files
     
     def _categorize_file_changes(self, include_tests: bool = False, collection_name: str = None) -> Tuple[List[Path], List[Path], List[str]]:
         """Categorize files into new, modified, and deleted."""
-        current_files = self._find_all_files(include_tests)
-        current_state = self._get_current_state(current_files)
-        previous_state = self._load_state(collection_name)
-        
-        new_files = []
-        modified_files = []
-        deleted_files = []
-        
-        # Categorize changed files
-        for file_path in current_files:
-            file_key = str(file_path.relative_to(self.project_path))
-            current_hash = current_state.get(file_key, {}).get("hash", "")
-            previous_hash = previous_state.get(file_key, {}).get("hash", "")
-            
-            if current_hash != previous_hash:
-                if previous_hash == "":  # Not in previous state = new file
-                    new_files.append(file_path)
-                else:  # In previous state but different hash = modified file
-                    modified_files.append(file_path)
-        
-        # Find deleted files
-        current_keys = set(current_state.keys())
-        previous_keys = set(k for k in previous_state.keys() if not k.startswith('_'))  # Exclude metadata
-        deleted_keys = previous_keys - current_keys
-        deleted_files.extend(deleted_keys)
-        
+        changed_files, new_files, deleted_files = self._diff_file_states(include_tests, collection_name)
+        new_set = set(new_files)
+        modified_files = [f for f in changed_files if f not in new_set]
         return new_files, modified_files, deleted_files
     
     def _get_vectored_files(self, collection_name: str) -> Set[str]:
@@ -699,53 +715,34 @@ class CoreIndexer:
             else:
                 qdrant_client = self.vector_store.client
             
-            # Scroll through all points to get file paths
-            file_paths = set()
-            scroll_result = qdrant_client.scroll(
-                collection_name=collection_name,
-                limit=10000,  # Large batch size
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            points = scroll_result[0]  # First element is the points list
-            next_page_offset = scroll_result[1]  # Second element is next page offset
-            
-            # Process first batch
-            for point in points:
-                payload = point.payload if hasattr(point, 'payload') else {}
-                file_path = payload.get('file_path')
-                if file_path:
-                    # Convert to relative path for consistency
-                    try:
-                        rel_path = str(Path(file_path).relative_to(self.project_path))
-                        file_paths.add(rel_path)
-                    except ValueError:
-                        # If relative_to fails, use the file_path as-is
-                        file_paths.add(file_path)
-            
-            # Handle pagination if there are more points
-            while next_page_offset is not None:
-                scroll_result = qdrant_client.scroll(
+            # Scroll through all points, collecting each distinct raw file path once
+            raw_paths = set()
+            next_page_offset = None
+            while True:
+                points, next_page_offset = qdrant_client.scroll(
                     collection_name=collection_name,
                     offset=next_page_offset,
-                    limit=10000,
+                    limit=10000,  # Large batch size
                     with_payload=True,
                     with_vectors=False
                 )
-                
-                points = scroll_result[0]
-                next_page_offset = scroll_result[1]
-                
-                for point in points:
-                    payload = point.payload if hasattr(point, 'payload') else {}
-                    file_path = payload.get('file_path')
-                    if file_path:
-                        try:
-                            rel_path = str(Path(file_path).relative_to(self.project_path))
-                            file_paths.add(rel_path)
-                        except ValueError:
-                            file_paths.add(file_path)
+                raw_paths.update(
+                    point.payload.get('file_path') for point in points
+                    if getattr(point, 'payload', None)
+                )
+                if next_page_offset is None:
+                    break
+            raw_paths.discard(None)
+            raw_paths.discard('')
+            
+            # Many points share a file, so relativize per distinct path rather than per point
+            file_paths = set()
+            for file_path in raw_paths:
+                try:
+                    file_paths.add(str(Path(file_path).relative_to(self.project_path)))
+                except ValueError:
+                    # If relative_to fails, use the file_path as-is
+                    file_paths.add(file_path)
             
             return file_paths
         except Exception as e:
@@ -998,49 +995,25 @@ class CoreIndexer:
             if implementation_chunks:
                 implementation_entity_names = {chunk.entity_name for chunk in implementation_chunks}
             
-            # Batch process entities with progressive disclosure
+            # Prepare texts for every point kind, then embed them in one batch
+            metadata_chunks = []
             if entities:
                 if logger:
                     logger.debug(f"🧠 Processing entities: {len(entities)} items")
                 
                 # Convert entities to metadata chunks for dual storage
-                metadata_chunks = []
                 for entity in entities:
                     has_implementation = entity.name in implementation_entity_names
                     metadata_chunk = EntityChunk.create_metadata_chunk(entity, has_implementation)
                     metadata_chunks.append(metadata_chunk)
-                
-                metadata_texts = [chunk.content for chunk in metadata_chunks]
-                if logger:
-                    logger.debug(f"🔤 Generating embeddings for {len(metadata_texts)} entity texts")
-                
-                embedding_results = self.embedder.embed_batch(metadata_texts)
-                if logger:
-                    logger.debug(f"🔤 Entity embeddings: processing {len(metadata_texts)} texts...")
-                if logger:
-                    logger.debug(f"✅ Entity embeddings completed: {sum(1 for r in embedding_results if r.success)}/{len(embedding_results)} successful")
-                
-                # Process embedding results for metadata chunks
-                cost_data = self._collect_embedding_cost_data(embedding_results)
-                total_tokens += cost_data['tokens']
-                total_cost += cost_data['cost']
-                total_requests += cost_data['requests']
-                
-                for chunk, embedding_result in zip(metadata_chunks, embedding_results):
-                    if embedding_result.success:
-                        point = self.vector_store.create_chunk_point(
-                            chunk, embedding_result.embedding, collection_name
-                        )
-                        all_points.append(point)
-            
-            # Batch process relations
+            
+            unique_relations = []
             if relations:
                 if logger:
                     logger.debug(f"🔗 Processing relations: {len(relations)} items")
                 
                 # Deduplicate relations BEFORE embedding to save API costs
                 seen_relation_keys = set()
-                unique_relations = []
                 duplicate_count = 0
                 duplicate_details = {}
                 
@@ -1070,59 +1043,61 @@ class CoreIndexer:
                 logger.debug(f"   Duplicates removed: {duplicate_count}")
                 if duplicate_details:
                     logger.debug(f"   Duplicates by type: {duplicate_details}")
-                    
-                relation_texts = [self._relation_to_text(relation) for relation in unique_relations]
-                if logger:
-                    logger.debug(f"🔤 Generating embeddings for {len(relation_texts)} unique relation texts")
-                    
-                embedding_results = self.embedder.embed_batch(relation_texts)
-                if logger:
-                    logger.debug(f"🔤 Relation embeddings: processing {len(relation_texts)} texts...")
+            
+            if implementation_chunks and logger:
+                logger.debug(f"💻 Processing implementation chunks: {len(implementation_chunks)} items")
+            
+            metadata_texts = [chunk.content for chunk in metadata_chunks]
+            relation_texts = [self._relation_to_text(relation) for relation in unique_relations]
+            implementation_texts = [chunk.content for chunk in implementation_chunks]
+            all_texts = metadata_texts + relation_texts + implementation_texts
+            
+            # A single embed_batch call lets the embedder fill its own request
+            # batches instead of paying per-kind round trips
+            embedding_results = []
+            if all_texts:
                 if logger:
-                    logger.debug(f"✅ Relation embeddings completed: {sum(1 for r in embedding_results if r.success)}/{len(embedding_results)} successful")
-                
-                # Process embedding results for relations
-                cost_data = self._collect_embedding_cost_data(embedding_results)
-                total_tokens += cost_data['tokens']
-                total_cost += cost_data['cost']
-                total_requests += cost_data['requests']
+                    logger.debug(f"🔤 Generating embeddings for {len(all_texts)} texts "
+                                 f"({len(metadata_texts)} entities, {len(relation_texts)} relations, "
+                                 f"{len(implementation_texts)} implementations)")
                 
-                for relation, embedding_result in zip(unique_relations, embedding_results):
-                    if embedding_result.success:
-                        # Convert relation to chunk for v2.4 pure architecture
-                        relation_chunk = RelationChunk.from_relation(relation)
-                        point = self.vector_store.create_relation_chunk_point(
-                            relation_chunk, embedding_result.embedding, collection_name
-                        )
-                        all_points.append(point)
-            
-            # Batch process implementation chunks for progressive disclosure
-            if implementation_chunks:
-                if logger:
-                    logger.debug(f"💻 Processing implementation chunks: {len(implementation_chunks)} items")
-                    
-                implementation_texts = [chunk.content for chunk in implementation_chunks]
-                if logger:
-                    logger.debug(f"🔤 Generating embeddings for {len(implementation_texts)} implementation texts")
-                    
-                embedding_results = self.embedder.embed_batch(implementation_texts)
+                embedding_results = self.embedder.embed_batch(all_texts)
                 if logger:
-                    logger.debug(f"🔤 Implementation embeddings: processing {len(implementation_texts)} texts...")
-                if logger:
-                    logger.debug(f"✅ Implementation embeddings completed: {sum(1 for r in embedding_results if r.success)}/{len(embedding_results)} successful")
+                    logger.debug(f"✅ Embeddings completed: {sum(1 for r in embedding_results if r.success)}/{len(embedding_results)} successful")
                 
-                # Process embedding results for implementation chunks
                 cost_data = self._collect_embedding_cost_data(embedding_results)
                 total_tokens += cost_data['tokens']
                 total_cost += cost_data['cost']
                 total_requests += cost_data['requests']
-                
-                for chunk, embedding_result in zip(implementation_chunks, embedding_results):
-                    if embedding_result.success:
-                        point = self.vector_store.create_chunk_point(
-                            chunk, embedding_result.embedding, collection_name
-                        )
-                        all_points.append(point)
+            
+            relation_offset = len(metadata_texts)
+            implementation_offset = relation_offset + len(relation_texts)
+            metadata_results = embedding_results[:relation_offset]
+            relation_results = embedding_results[relation_offset:implementation_offset]
+            implementation_results = embedding_results[implementation_offset:]
+            
+            for chunk, embedding_result in zip(metadata_chunks, metadata_results):
+                if embedding_result.success:
+                    point = self.vector_store.create_chunk_point(
+                        chunk, embedding_result.embedding, collection_name
+                    )
+                    all_points.append(point)
+            
+            for relation, embedding_result in zip(unique_relations, relation_results):
+                if embedding_result.success:
+                    # Convert relation to chunk for v2.4 pure architecture
+                    relation_chunk = RelationChunk.from_relation(relation)
+                    point = self.vector_store.create_relation_chunk_point(
+                        relation_chunk, embedding_result.embedding, collection_name
+                    )
+                    all_points.append(point)
+            
+            for chunk, embedding_result in zip(implementation_chunks, implementation_results):
+                if embedding_result.success:
+                    point = self.vector_store.create_chunk_point(
+                        chunk, embedding_result.embedding, collection_name
+                    )
+                    all_points.append(point)
             
             # Store cost tracking data for result reporting
             if not hasattr(self, '_session_cost_data'):
@@ -1255,12 +1230,15 @@ class CoreIndexer:
         for file_path in files:
             try:
                 relative_path = str(file_path.relative_to(self.project_path))
+                # Stat before hashing: a write in between then leaves a stale
+                # mtime next to the old hash, so the next run re-reads the file
+                stat = file_path.stat()
                 file_hash = self._get_file_hash(file_path)
                 
                 state[relative_path] = {
                     "hash": file_hash,
-                    "size": file_path.stat().st_size,
-                    "mtime": file_path.stat().st_mtime
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime
                 }
             except Exception:
                 continue
@@ -1305,12 +1283,23 @@ class CoreIndexer:
             return ""
     
     def _load_state(self, collection_name: str) -> Dict[str, Dict[str, Any]]:
-        """Load previous indexing state."""
+        """Load previous indexing state.
+        
+        The parsed JSON is reused until the file's inode, mtime or size changes
+        (every writer replaces it via rename), so per-file status checks within
+        a run do not re-parse it. Callers get a shallow copy they may mutate.
+        """
         try:
             state_file = self._get_state_file(collection_name)
             if state_file.exists():
-                with open(state_file) as f:
-                    return json.load(f)
+                stat = state_file.stat()
+                signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+                cached = self._state_cache.get(state_file)
+                if cached is None or cached[0] != signature:
+                    with open(state_file) as f:
+                        cached = (signature, json.load(f))
+                    self._state_cache[state_file] = cached
+                return dict(cached[1])
         except Exception:
             pass
         return {}
@@ -1486,74 +1475,44 @@ class CoreIndexer:
             except Exception:
                 pass  # Ignore cleanup errors
     
-    def _handle_deleted_files(self, collection_name: str, deleted_files: Union[str, List[str]], verbose: bool = False):
-        """Handle deleted files by removing their entities and orphaned relations."""
+    def _handle_deleted_files(self, collection_name: str, deleted_files: Union[str, List[str]], verbose: bool = False) -> bool:
+        """Handle deleted files by removing their entities and orphaned relations.
+        
+        Returns False if the files' entities could not be deleted.
+        """
         # Convert single path to list for unified handling
         if isinstance(deleted_files, str):
             deleted_files = [deleted_files]
             
         if not deleted_files:
-            return
+            return True
         
         total_entities_deleted = 0
         
         try:
-            for deleted_file in deleted_files:
+            # State file always stores relative paths, construct the full paths
+            # Note: deleted_file is always relative from state file (see _get_current_state)
+            # Don't use .resolve() as it adds /private on macOS, but entities are stored without it
+            full_paths = [str(self.project_path / deleted_file) for deleted_file in deleted_files]
+            
+            for deleted_file, full_path in zip(deleted_files, full_paths):
                 logger.info(f"🗑️ Handling deleted file: {deleted_file}")
-                
-                # State file always stores relative paths, construct the full path
-                # Note: deleted_file is always relative from state file (see _get_current_state)
-                # Don't use .resolve() as it adds /private on macOS, but entities are stored without it
-                full_path = str(self.project_path / deleted_file)
-                
                 if verbose:
                     logger.debug(f"   📁 Resolved to: {full_path}")
-                
-                # Use the vector store's find_entities_for_file method
-                logger.debug(f"   🔍 Finding ALL entities for file: {full_path}")
-                
-                point_ids = []
-                try:
-                    # Use the elegant single-query method
-                    found_entities = self.vector_store.find_entities_for_file(collection_name, full_path)
-                    
-                    if found_entities:
-                        logger.debug(f"   ✅ Found {len(found_entities)} entities for file")
-                        for entity in found_entities:
-                            entity_name = entity.get('name', 'Unknown')
-                            entity_type = entity.get('type', 'unknown')
-                            entity_id = entity.get('id')
-                            logger.debug(f"      🆔 ID: {entity_id}, name: '{entity_name}', type: {entity_type}")
-                        
-                        # Extract point IDs for deletion
-                        point_ids = [entity['id'] for entity in found_entities]
-                    else:
-                        logger.debug(f"   ⚠️ No entities found for {deleted_file}")
-                        
-                except Exception as e:
-                    logger.error(f"   ❌ Error finding entities: {e}")
-                    point_ids = []
-                
-                # Remove duplicates and delete all found points
-                point_ids = list(set(point_ids))
-                logger.info(f"   🎯 Total unique point IDs to delete: {len(point_ids)}")
-                if point_ids and verbose:
-                    logger.debug(f"      🆔 Point IDs: {point_ids}")
-                    
-                if point_ids:
-                    # Delete the points
-                    logger.info(f"🗑️ DEBUG: About to DELETE from Qdrant - file: '{deleted_file}' resolved to: '{full_path}' with {len(point_ids)} points")
-                    logger.info(f"   🗑️ Attempting to delete {len(point_ids)} points...")
-                    delete_result = self.vector_store.delete_points(collection_name, point_ids)
-                    
-                    if delete_result.success:
-                        entities_deleted = len(point_ids)
-                        total_entities_deleted += entities_deleted
-                        logger.info(f"   ✅ Successfully removed {entities_deleted} entities from {deleted_file}")
-                    else:
-                        logger.error(f"   ❌ Failed to remove entities from {deleted_file}: {delete_result.errors}")
+            
+            # One filter-based delete for every file instead of a lookup + delete per file
+            logger.info(f"   🗑️ Deleting entities for {len(full_paths)} files in one request...")
+            delete_result = self.vector_store.delete_by_files(collection_name, full_paths)
+            
+            if delete_result.success:
+                total_entities_deleted = delete_result.items_processed
+                if total_entities_deleted:
+                    logger.info(f"   ✅ Successfully removed {total_entities_deleted} entities from {len(full_paths)} files")
                 else:
-                    logger.warning(f"   ⚠️ No entities found for {deleted_file} - nothing to delete")
+                    logger.warning(f"   ⚠️ No entities found for {len(full_paths)} deleted files - nothing to delete")
+            else:
+                logger.error(f"   ❌ Failed to remove entities for deleted files: {delete_result.errors}")
+                return False
             
             # NEW: Clean up orphaned relations after entity deletion
             if total_entities_deleted > 0:
@@ -1570,6 +1529,9 @@ class CoreIndexer:
                         
         except Exception as e:
             logger.error(f"Error handling deleted files: {e}")
+            return False
+        
+        return True
     
     
     
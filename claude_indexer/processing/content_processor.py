@@ -42,15 +42,40 @@ class ContentHashMixin:
 class ContentProcessor(ContentHashMixin, ABC):
     """Base class for content processing with deduplication."""
     
+    # Label for this processor's items in log messages
+    item_name = "item"
+    
     def __init__(self, vector_store, embedder, logger=None):
         self.vector_store = vector_store
         self.embedder = embedder  
         self.logger = logger
     
     @abstractmethod
+    def prepare_batch(self, items: List, context: ProcessingContext) -> Tuple[List, int]:
+        """Turn raw items into chunks to embed; returns (to_embed, items_skipped)."""
+        pass
+    
     def process_batch(self, items: List, context: ProcessingContext) -> ProcessingResult:
         """Process a batch of content items."""
-        pass
+        to_embed, items_skipped = self.prepare_batch(items, context)
+        if not to_embed:
+            return ProcessingResult.success_result(items_skipped=items_skipped)
+        
+        embedding_results, cost_data = self.process_embeddings(to_embed, self.item_name)
+        return self.build_result(to_embed, items_skipped, embedding_results, cost_data, context.collection_name)
+    
+    def build_result(self, to_embed: List, items_skipped: int, embedding_results: List,
+                     cost_data: Dict, collection_name: str) -> ProcessingResult:
+        """Create points for embedded chunks and summarize the batch."""
+        points, failed_count = self.create_points(to_embed, embedding_results, collection_name, 'create_chunk_point')
+        
+        return ProcessingResult.success_result(
+            items_processed=len(to_embed) - failed_count,
+            items_skipped=items_skipped,
+            items_failed=failed_count,
+            cost_data=cost_data,
+            points_created=points
+        )
     
     def check_deduplication(self, items: List, collection_name: str) -> Tuple[List, List]:
         """Universal deduplication logic using content hashes."""
@@ -1,21 +1,22 @@
 """Specialized content processors for different entity types."""
 
-from typing import List, TYPE_CHECKING
+from typing import List, Tuple, TYPE_CHECKING
 from .content_processor import ContentProcessor
 from .context import ProcessingContext
-from .results import ProcessingResult
 
 if TYPE_CHECKING:
-    from ..analysis.entities import Entity, Relation, EntityChunk
+    from ..analysis.entities import Entity, Relation, EntityChunk, RelationChunk
 
 
 class EntityProcessor(ContentProcessor):
     """Processor for entity metadata with deduplication."""
     
-    def process_batch(self, entities: List['Entity'], context: ProcessingContext) -> ProcessingResult:
-        """Process entity metadata batch with deduplication."""
+    item_name = "entity"
+    
+    def prepare_batch(self, entities: List['Entity'], context: ProcessingContext) -> Tuple[List['EntityChunk'], int]:
+        """Build deduplicated entity metadata chunks."""
         if not entities:
-            return ProcessingResult.success_result()
+            return [], 0
         
         if self.logger:
             self.logger.debug(f"📋 Processing {len(entities)} entities for metadata")
@@ -34,22 +35,7 @@ class EntityProcessor(ContentProcessor):
         if self.logger and to_skip:
             self.logger.debug(f"⚡ Skipping {len(to_skip)} unchanged entities")
         
-        if not to_embed:
-            return ProcessingResult.success_result(items_skipped=len(to_skip))
-        
-        # Process embeddings
-        embedding_results, cost_data = self.process_embeddings(to_embed, "entity")
-        
-        # Create points
-        points, failed_count = self.create_points(to_embed, embedding_results, context.collection_name, 'create_chunk_point')
-        
-        return ProcessingResult.success_result(
-            items_processed=len(to_embed) - failed_count,
-            items_skipped=len(to_skip),
-            items_failed=failed_count,
-            cost_data=cost_data,
-            points_created=points
-        )
+        return to_embed, len(to_skip)
     
     def _create_metadata_chunk(self, entity: 'Entity', has_implementation: bool) -> 'EntityChunk':
         """Create metadata chunk from entity with token validation."""
@@ -85,10 +71,12 @@ class EntityProcessor(ContentProcessor):
 class RelationProcessor(ContentProcessor):
     """Processor for relations with smart filtering."""
     
-    def process_batch(self, relations: List['Relation'], context: ProcessingContext) -> ProcessingResult:
-        """Process relations batch with smart filtering based on changed entities."""
+    item_name = "relation"
+    
+    def prepare_batch(self, relations: List['Relation'], context: ProcessingContext) -> Tuple[List['RelationChunk'], int]:
+        """Build deduplicated chunks for relations that involve changed entities."""
         if not relations:
-            return ProcessingResult.success_result()
+            return [], 0
         
         if self.logger:
             self.logger.debug(f"🔗 Processing {len(relations)} relations")
@@ -101,7 +89,7 @@ class RelationProcessor(ContentProcessor):
             self.logger.debug(f"🔍 Filtered to {len(relevant_relations)} relevant relations (skipped {skipped_count} unchanged)")
         
         if not relevant_relations:
-            return ProcessingResult.success_result(items_skipped=len(relations))
+            return [], len(relations)
         
         # Convert relations to relation chunks
         relation_chunks = []
@@ -115,24 +103,8 @@ class RelationProcessor(ContentProcessor):
         if self.logger and to_skip:
             self.logger.debug(f"⚡ Skipping {len(to_skip)} unchanged relations")
         
-        if not to_embed:
-            return ProcessingResult.success_result(items_skipped=len(to_skip))
-        
-        # Process embeddings
-        embedding_results, cost_data = self.process_embeddings(to_embed, "relation")
-        
-        # Create points
-        points, failed_count = self.create_points(to_embed, embedding_results, context.collection_name, 'create_chunk_point')
-        
         total_skipped = len(to_skip) + (len(relations) - len(relevant_relations))
-        
-        return ProcessingResult.success_result(
-            items_processed=len(to_embed) - failed_count,
-            items_skipped=total_skipped,
-            items_failed=failed_count,
-            cost_data=cost_data,
-            points_created=points
-        )
+        return to_embed, total_skipped
     
     def _filter_relevant_relations(self, relations: List['Relation'], context: ProcessingContext) -> List['Relation']:
         """Filter relations to only include those involving changed entities."""
@@ -185,10 +157,12 @@ class RelationProcessor(ContentProcessor):
 class ImplementationProcessor(ContentProcessor):
     """Processor for implementation chunks with deduplication."""
     
-    def process_batch(self, implementation_chunks: List['EntityChunk'], context: ProcessingContext) -> ProcessingResult:
-        """Process implementation chunks batch with deduplication and token validation."""
+    item_name = "implementation"
+    
+    def prepare_batch(self, implementation_chunks: List['EntityChunk'], context: ProcessingContext) -> Tuple[List['EntityChunk'], int]:
+        """Validate token sizes and deduplicate implementation chunks."""
         if not implementation_chunks:
-            return ProcessingResult.success_result()
+            return [], 0
         
         if self.logger:
             self.logger.debug(f"💻 Processing {len(implementation_chunks)} implementation chunks")
@@ -205,22 +179,7 @@ class ImplementationProcessor(ContentProcessor):
         if self.logger and to_skip:
             self.logger.debug(f"⚡ Skipping {len(to_skip)} unchanged implementation chunks")
         
-        if not to_embed:
-            return ProcessingResult.success_result(items_skipped=len(to_skip))
-        
-        # Process embeddings
-        embedding_results, cost_data = self.process_embeddings(to_embed, "implementation")
-        
-        # Create points
-        points, failed_count = self.create_points(to_embed, embedding_results, context.collection_name, 'create_chunk_point')
-        
-        return ProcessingResult.success_result(
-            items_processed=len(to_embed) - failed_count,
-            items_skipped=len(to_skip),
-            items_failed=failed_count,
-            cost_data=cost_data,
-            points_created=points
-        )
+        return to_embed, len(to_skip)
     
     def _validate_chunk_tokens(self, chunk: 'EntityChunk') -> 'EntityChunk':
         """Validate and truncate chunk content if it exceeds token limits."""
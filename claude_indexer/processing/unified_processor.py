@@ -43,38 +43,37 @@ class UnifiedContentProcessor:
         combined_result = ProcessingResult.success_result()
         
         try:
-            # Phase 1: Process entities
-            if entities:
+            # Phases 1-3: Build deduplicated chunks for entities, relations and implementations
+            phases = (
+                ("Phase 1", self.entity_processor, entities),
+                ("Phase 2", self.relation_processor, relations),
+                ("Phase 3", self.impl_processor, implementation_chunks),
+            )
+            prepared = []
+            for phase, processor, items in phases:
+                if not items:
+                    continue
                 if self.logger:
-                    self.logger.debug(f"🔄 Phase 1: Processing {len(entities)} entities")
-                
-                entity_result = self.entity_processor.process_batch(entities, context)
-                if not entity_result.success:
-                    return entity_result
-                combined_result = combined_result.combine_with(entity_result)
-                all_points.extend(entity_result.points_created)
+                    self.logger.debug(f"🔄 {phase}: Processing {len(items)} {processor.item_name} items")
+                to_embed, items_skipped = processor.prepare_batch(items, context)
+                prepared.append((processor, to_embed, items_skipped))
             
-            # Phase 2: Process relations (with smart filtering based on changed entities)
-            if relations:
-                if self.logger:
-                    self.logger.debug(f"🔄 Phase 2: Processing {len(relations)} relations")
-                
-                relation_result = self.relation_processor.process_batch(relations, context)
-                if not relation_result.success:
-                    return relation_result
-                combined_result = combined_result.combine_with(relation_result)
-                all_points.extend(relation_result.points_created)
+            # Embed every kind's texts in a single embed_batch call (the processors
+            # share one embedder, so any of them can run it)
+            all_to_embed = [item for _, to_embed, _ in prepared for item in to_embed]
+            embedding_results = []
+            if all_to_embed:
+                embedding_results, cost_data = self.entity_processor.process_embeddings(all_to_embed, "content")
+                combined_result = combined_result.combine_with(ProcessingResult.success_result(cost_data=cost_data))
             
-            # Phase 3: Process implementation chunks
-            if implementation_chunks:
-                if self.logger:
-                    self.logger.debug(f"🔄 Phase 3: Processing {len(implementation_chunks)} implementation chunks")
-                
-                impl_result = self.impl_processor.process_batch(implementation_chunks, context)
-                if not impl_result.success:
-                    return impl_result
-                combined_result = combined_result.combine_with(impl_result)
-                all_points.extend(impl_result.points_created)
+            # Slice the results back to the processor that owns each chunk
+            offset = 0
+            for processor, to_embed, items_skipped in prepared:
+                results = embedding_results[offset:offset + len(to_embed)]
+                offset += len(to_embed)
+                phase_result = processor.build_result(to_embed, items_skipped, results, {}, collection_name)
+                combined_result = combined_result.combine_with(phase_result)
+                all_points.extend(phase_result.points_created)
             
             # Phase 4: Batch store all points
             if all_points:
@@ -72,6 +72,9 @@ class VectorPoint:
 class VectorStore(ABC):
     """Abstract base class for vector storage backends."""
     
+    # Points sent per upsert request by batch_upsert
+    UPSERT_BATCH_SIZE = 512
+    
     @abstractmethod
     def create_collection(self, collection_name: str, vector_size: int, 
                          distance_metric: str = "cosine") -> StorageResult:
@@ -121,10 +124,11 @@ class VectorStore(ABC):
         return int(hash_hex, 16)
     
     def batch_upsert(self, collection_name: str, points: List[VectorPoint],
-                    batch_size: int = 100) -> StorageResult:
+                    batch_size: Optional[int] = None) -> StorageResult:
         """Upsert points in batches."""
         import time
         
+        batch_size = batch_size or self.UPSERT_BATCH_SIZE
         start_time = time.time()
         total_processed = 0
         total_failed = 0
@@ -352,6 +356,24 @@ class CachingVectorStore(VectorStore):
             
             return results
     
+    def delete_by_files(self, collection_name: str, file_paths: List[str]) -> StorageResult:
+        """Delegate bulk file deletion to backend"""
+        file_paths = list(file_paths)
+        if not file_paths:
+            # Nothing removed, so keep the search cache and skip the backend
+            return StorageResult(success=True, operation="delete")
+        
+        self._search_cache.clear()
+        if hasattr(self.backend, 'delete_by_files'):
+            return self.backend.delete_by_files(collection_name, file_paths)
+        
+        # Fallback: look up each file's points and delete them together
+        point_ids = {entity["id"] for file_path in file_paths
+                     for entity in self.find_entities_for_file(collection_name, file_path)}
+        if not point_ids:
+            return StorageResult(success=True, operation="delete")
+        return self.backend.delete_points(collection_name, list(point_ids))
+    
     def _cleanup_orphaned_relations(self, collection_name: str, verbose: bool = False):
         """Delegate orphaned relation cleanup to backend"""
         if hasattr(self.backend, '_cleanup_orphaned_relations'):
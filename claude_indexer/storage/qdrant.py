@@ -46,6 +46,15 @@ except ImportError:
         pass
 
 
+class SearchHit:
+    """Minimal search result returned by the legacy search helpers."""
+    
+    def __init__(self, id, score, payload):
+        self.id = id
+        self.score = score
+        self.payload = payload
+
+
 class ContentHashMixin:
     """Mixin for content-addressable storage functionality"""
     
@@ -89,8 +98,19 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
         "dot": Distance.DOT
     }
     
+    # Payload keys that deletes, dedup checks and per-type counts filter on
+    KEYWORD_INDEX_FIELDS = ("file_path", "entity_name", "content_hash", "chunk_type")
+    
+    # Maximum file paths matched by a single bulk-delete filter
+    DELETE_BATCH_SIZE = 512
+    
+    # URL that selects qdrant-client's in-process local mode instead of a server
+    IN_MEMORY_URL = ":memory:"
+    
     def __init__(self, url: str = "http://localhost:6333", api_key: str = None,
-                 timeout: float = 60.0, auto_create_collections: bool = True, **kwargs):
+                 timeout: float = 60.0, auto_create_collections: bool = True,
+                 prefer_grpc: bool = False, grpc_port: int = 6334,
+                 indexing_threshold: int = 100, **kwargs):
         
         if not QDRANT_AVAILABLE:
             raise ImportError("Qdrant client not available. Install with: pip install qdrant-client")
@@ -100,6 +120,11 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
         self.url = url
         self.api_key = api_key if api_key and api_key.strip() else None  # Skip empty/blank keys
         self.timeout = timeout
+        self.prefer_grpc = prefer_grpc
+        # Segments below this many vectors are searched brute-force, without HNSW
+        self.indexing_threshold = indexing_threshold
+        # Collections this store has already checked for KEYWORD_INDEX_FIELDS
+        self._indexed_collections = set()
         
         # Initialize client
         try:
@@ -107,13 +132,21 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
             with warnings.catch_warnings():
                 warnings.filterwarnings("ignore", message="Api key is used with an insecure connection")
                 
-                # Only pass api_key if it has a value
-                client_kwargs = {
-                    'url': url,
-                    'timeout': timeout
-                }
-                if self.api_key:
-                    client_kwargs['api_key'] = self.api_key
+                if url == self.IN_MEMORY_URL:
+                    # In-process local mode: no server, nothing persisted
+                    client_kwargs = {'location': url}
+                else:
+                    # Only pass api_key if it has a value
+                    client_kwargs = {
+                        'url': url,
+                        'timeout': timeout
+                    }
+                    if self.api_key:
+                        client_kwargs['api_key'] = self.api_key
+                    # gRPC has lower per-call overhead than REST for many small requests
+                    if prefer_grpc:
+                        client_kwargs['prefer_grpc'] = True
+                        client_kwargs['grpc_port'] = grpc_port
                 
                 self.client = QdrantClient(**client_kwargs)
             
@@ -159,18 +192,11 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
                 collection_name=collection_name,
                 vectors_config=VectorParams(size=vector_size, distance=distance),
                 optimizers_config={
-                    "indexing_threshold": 100
+                    "indexing_threshold": self.indexing_threshold
                 }
             )
             logger.debug(f"Qdrant create_collection response: {create_response}")
             
-            return StorageResult(
-                success=True,
-                operation="create_collection",
-                items_processed=1,
-                processing_time=time.time() - start_time
-            )
-            
         except Exception as e:
             return StorageResult(
                 success=False,
@@ -178,6 +204,50 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
                 processing_time=time.time() - start_time,
                 errors=[f"Failed to create collection {collection_name}: {e}"]
             )
+        
+        self._ensure_payload_indexes(collection_name, indexed_fields=())
+        
+        return StorageResult(
+            success=True,
+            operation="create_collection",
+            items_processed=1,
+            processing_time=time.time() - start_time
+        )
+    
+    def ensure_collection(self, collection_name: str, vector_size: Optional[int] = None) -> bool:
+        """Ensure collection exists and carries the keyword payload indexes.
+        
+        Collections created before a field joined KEYWORD_INDEX_FIELDS get the
+        missing indexes the first time this store opens them.
+        """
+        if not super().ensure_collection(collection_name, vector_size):
+            return False
+        if collection_name not in self._indexed_collections:
+            self._ensure_payload_indexes(collection_name)
+        return True
+    
+    def _ensure_payload_indexes(self, collection_name: str, indexed_fields=None) -> None:
+        """Create any missing KEYWORD_INDEX_FIELDS indexes on a collection.
+        
+        Keyword indexes let these filters use an inverted index instead of a
+        full scan. The collection is usable without them, so a failure here is
+        only a warning. ``indexed_fields`` skips the schema lookup when the
+        caller already knows which indexes exist.
+        """
+        try:
+            if indexed_fields is None:
+                indexed_fields = self.client.get_collection(collection_name).payload_schema or {}
+            from qdrant_client import models
+            for field_name in self.KEYWORD_INDEX_FIELDS:
+                if field_name not in indexed_fields:
+                    self.client.create_payload_index(
+                        collection_name=collection_name,
+                        field_name=field_name,
+                        field_schema=models.PayloadSchemaType.KEYWORD
+                    )
+            self._indexed_collections.add(collection_name)
+        except Exception as e:
+            logger.warning(f"Failed to create payload indexes for collection {collection_name}: {e}")
     
     def collection_exists(self, collection_name: str) -> bool:
         """Check if collection exists."""
@@ -248,7 +318,10 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
             # Upsert to Qdrant
             self.client.upsert(
                 collection_name=collection_name,
-                points=qdrant_points
+                points=qdrant_points,
+                # Block until applied: a merely queued update that later fails
+                # would otherwise be counted as stored
+                wait=True
             )
             
             return StorageResult(
@@ -387,16 +460,27 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
                 "error": str(e)
             }
     
-    def count(self, collection_name: str) -> int:
-        """Count total points in collection - test compatibility method."""
+    def count(self, collection_name: str, exact: bool = False) -> int:
+        """Count total points in collection - test compatibility method.
+        
+        By default this reads the collection's points_count metadata; pass
+        exact=True to have Qdrant walk the segments for a precise count.
+        """
         try:
+            if exact:
+                return self.client.count(collection_name=collection_name, exact=True).count
             collection_info = self.client.get_collection(collection_name)
             return collection_info.points_count
         except Exception:
             return 0
     
-    def search(self, collection_name: str, query_vector, top_k: int = 10):
-        """Legacy search interface for test compatibility."""
+    def search(self, collection_name: str, query_vector, top_k: int = 10,
+               payload_fields: Optional[List[str]] = None):
+        """Legacy search interface for test compatibility.
+        
+        payload_fields limits each hit's payload to those keys (projected
+        server-side); by default the full payload is returned.
+        """
         try:
             if hasattr(query_vector, 'tolist'):
                 query_vector = query_vector.tolist()
@@ -408,22 +492,48 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
             search_results = self.client.search(
                 collection_name=collection_name,
                 query_vector=query_vector,
-                limit=top_k
+                limit=top_k,
+                with_payload=payload_fields or True
             )
             
             # Return results in expected format for tests
-            class SearchHit:
-                def __init__(self, id, score, payload):
-                    self.id = id
-                    self.score = score
-                    self.payload = payload
-            
             return [SearchHit(result.id, result.score, result.payload) for result in search_results]
             
         except Exception as e:
             logger.debug(f"Search failed: {e}")
             return []
     
+    def search_batch(self, collection_name: str, query_vectors, top_k: int = 10,
+                     payload_fields: Optional[List[str]] = None):
+        """Run several legacy searches in a single request.
+        
+        Returns one hit list per query vector, in the same order.
+        """
+        try:
+            from qdrant_client import models
+            
+            requests = [
+                models.SearchRequest(
+                    vector=vector.tolist() if hasattr(vector, 'tolist') else list(vector),
+                    limit=top_k,
+                    with_payload=payload_fields or True
+                )
+                for vector in query_vectors
+            ]
+            batch_results = self.client.search_batch(
+                collection_name=collection_name,
+                requests=requests
+            )
+            
+            return [
+                [SearchHit(result.id, result.score, result.payload) for result in results]
+                for results in batch_results
+            ]
+            
+        except Exception as e:
+            logger.debug(f"Batch search failed: {e}")
+            return [[] for _ in query_vectors]
+    
     def list_collections(self) -> List[str]:
         """List all collections."""
         try:
@@ -438,7 +548,8 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
         scroll_filter: Optional[Any] = None,
         limit: int = 1000,
         with_vectors: bool = False,
-        handle_pagination: bool = True
+        handle_pagination: bool = True,
+        with_payload: Union[bool, List[str]] = True
     ) -> List[Any]:
         """
         Unified scroll method for retrieving points from a collection.
@@ -449,6 +560,7 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
             limit: Maximum number of points per page (default: 1000)
             with_vectors: Whether to include vectors in results (default: False)
             handle_pagination: If True, retrieves all pages; if False, only first page
+            with_payload: True for full payloads, or the list of payload keys to return
             
         Returns:
             List of points matching the criteria
@@ -477,7 +589,7 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
                     scroll_filter=scroll_filter,
                     limit=limit,
                     offset=offset,
-                    with_payload=True,
+                    with_payload=with_payload,
                     with_vectors=with_vectors
                 )
                 
@@ -765,7 +877,9 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
                 ),
                 limit=1000,
                 with_vectors=False,
-                handle_pagination=True
+                handle_pagination=True,
+                # Only the names are read; skip content and metadata on the wire
+                with_payload=['entity_name', 'name']
             )
             
             for point in points:
@@ -867,6 +981,75 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
             # Fallback to search_similar if scroll is not available
             return self._find_entities_for_file_fallback(collection_name, file_path)
     
+    def delete_by_files(self, collection_name: str, file_paths: List[str]) -> StorageResult:
+        """Delete every point belonging to any of the given files.
+        
+        Uses the same OR logic as find_entities_for_file (file_path or File
+        entity name), but as a filter-based delete, so the cost is one count and
+        one delete per DELETE_BATCH_SIZE files rather than per file or point.
+        
+        Qdrant deletes are already tombstones: points are only marked deleted
+        and the optimizer vacuums segments in the background, so there is no
+        soft-delete flag for readers to filter on.
+        """
+        start_time = time.time()
+        file_paths = list(file_paths)
+        
+        if not file_paths:
+            return StorageResult(success=True, operation="delete",
+                                 processing_time=time.time() - start_time)
+        
+        try:
+            from qdrant_client import models
+            
+            matched = 0
+            # Cap paths per filter so a mass deletion never builds one huge request
+            for start in range(0, len(file_paths), self.DELETE_BATCH_SIZE):
+                batch = file_paths[start:start + self.DELETE_BATCH_SIZE]
+                files_filter = models.Filter(
+                    should=[
+                        models.FieldCondition(
+                            key="file_path",
+                            match=models.MatchAny(any=batch)
+                        ),
+                        models.FieldCondition(
+                            key="entity_name",
+                            match=models.MatchAny(any=batch)
+                        ),
+                    ]
+                )
+                
+                # Count first so callers know whether anything was removed
+                batch_matched = self.client.count(
+                    collection_name=collection_name,
+                    count_filter=files_filter,
+                    exact=True
+                ).count
+                
+                if batch_matched:
+                    self.client.delete(
+                        collection_name=collection_name,
+                        points_selector=models.FilterSelector(filter=files_filter),
+                        wait=True
+                    )
+                matched += batch_matched
+            
+            return StorageResult(
+                success=True,
+                operation="delete",
+                items_processed=matched,
+                processing_time=time.time() - start_time
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Exception in delete_by_files: {e}")
+            return StorageResult(
+                success=False,
+                operation="delete",
+                processing_time=time.time() - start_time,
+                errors=[f"Failed to delete points for {len(file_paths)} files: {e}"]
+            )
+    
     def _find_entities_for_file_fallback(self, collection_name: str, file_path: str) -> List[Dict[str, Any]]:
         """Fallback implementation using search_similar."""
         dummy_vector = [0.1] * 1536
@@ -930,7 +1113,10 @@ class QdrantStore(ManagedVectorStore, ContentHashMixin):
                 collection_name=collection_name,
                 limit=10000,  # Large batch size for efficiency
                 with_vectors=False,
-                handle_pagination=True
+                handle_pagination=True,
+                # Only the fields read below, not every point's content
+                with_payload=['type', 'chunk_type', 'entity_name', 'name',
+                              'relation_target', 'import_type']
             )
             
             # Process in-memory to ensure consistency
@@ -506,16 +506,46 @@ class AsyncWatcherHandler:
             return False
     
     async def _handle_deletions(self, file_paths: list):
-        """Handle file deletions by removing related entities."""
+        """Handle file deletions by removing related entities.
+        
+        The debounced batch already names the deleted paths, so they go straight
+        to the indexer's shared deletion logic instead of re-scanning the tree.
+        """
         try:
             print(f"🗑️  Processing {len(file_paths)} deleted files...")
             
-            # Trigger incremental indexing to handle deletions and cleanup orphaned relations
-            # This uses the existing state-based deletion detection which will:
-            # 1. Detect the deleted files via SHA256 state comparison
-            # 2. Call _handle_deleted_files() which removes entities
-            # 3. Automatically clean up orphaned relations via _cleanup_orphaned_relations()
-            success = await self._index_files([])  # Empty list triggers incremental indexing
+            loop = asyncio.get_running_loop()
+            
+            def run_deletion():
+                from ..indexer import CoreIndexer
+                
+                repo_path = Path(self.repo_path)
+                relative_paths = []
+                for file_path in file_paths:
+                    path = Path(file_path)
+                    # Skip phantom deletions (e.g. editors saving via rename)
+                    if path.exists():
+                        continue
+                    try:
+                        relative_paths.append(str(path.relative_to(repo_path)))
+                    except ValueError:
+                        continue
+                
+                if not relative_paths:
+                    return True
+                
+                # Same steps as incremental indexing: drop the files' entities and
+                # orphaned relations, then remove them from the state file
+                collection_name = getattr(self.config, 'collection_name', 'default')
+                indexer = CoreIndexer(self.config, self.embedder, self.store, repo_path)
+                if not indexer._handle_deleted_files(collection_name, relative_paths):
+                    # Keep the state entries so the next index run retries the cleanup
+                    return False
+                indexer._update_state([], collection_name, full_rebuild=False,
+                                      deleted_files=relative_paths)
+                return True
+            
+            success = await loop.run_in_executor(None, run_deletion)
             
             if success:
                 print(f"✅ Cleanup completed for {len(file_paths)} deleted files")
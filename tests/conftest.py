@@ -8,41 +8,39 @@ Provides test fixtures for:
 - Configuration management
 """
 
+from __future__ import annotations
+
+import functools
+import hashlib
+import itertools
 import os
 import shutil
+import socket
+import sys
 import tempfile
+import uuid
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Iterator
+from typing import TYPE_CHECKING, AsyncIterator, Iterator
 
+import httpx
 import pytest
+import pytest_asyncio
 import numpy as np
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, CollectionInfo
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client.models import FieldCondition, Filter, FilterSelector, MatchValue
 
-# Import project components
-try:
+if TYPE_CHECKING:
     from claude_indexer.config import IndexerConfig
-    from claude_indexer.embeddings.openai import OpenAIEmbedder
     from claude_indexer.storage.qdrant import QdrantStore
-except ImportError:
-    # Graceful fallback for missing imports during test discovery
-    IndexerConfig = None
-    OpenAIEmbedder = None
-    QdrantStore = None
 
 
 # ---------------------------------------------------------------------------
-# Temporary repository fixture
+# Sample file contents (encoded once at import, written via write_bytes)
 # ---------------------------------------------------------------------------
 
-@pytest.fixture()
-def temp_repo(tmp_path_factory) -> Path:
-    """Create a temporary repository with sample Python files for testing."""
-    repo_path = tmp_path_factory.mktemp("sample_repo")
-    
-    # Create sample Python files
-    (repo_path / "foo.py").write_text('''"""Sample module with functions."""
+_FOO_PY = b'''"""Sample module with functions."""
 
 def add(x, y):
     """Return sum of two numbers."""
@@ -54,9 +52,9 @@ class Calculator:
     def multiply(self, a, b):
         """Multiply two numbers."""
         return a * b
-''')
-    
-    (repo_path / "bar.py").write_text('''"""Module that imports and uses foo."""
+'''
+
+_BAR_PY = b'''"""Module that imports and uses foo."""
 from foo import add, Calculator
 
 def main():
@@ -68,35 +66,127 @@ def main():
 
 if __name__ == "__main__":
     main()
-''')
-    
-    # Create a subdirectory with more code
-    subdir = repo_path / "utils"
-    subdir.mkdir()
-    (subdir / "__init__.py").write_text("")
-    (subdir / "helpers.py").write_text('''"""Helper utilities."""
+'''
+
+_HELPERS_PY = b'''"""Helper utilities."""
 
 def format_output(value):
     """Format value for display."""
     return f"Value: {value}"
 
 LOG_LEVEL = "INFO"
-''')
-    
-    # Create a test file (will be excluded by default)
-    test_dir = repo_path / "tests"
-    test_dir.mkdir()
-    (test_dir / "test_foo.py").write_text('''"""Tests for foo module."""
+'''
+
+_TEST_FOO_PY = b'''"""Tests for foo module."""
 import pytest
 from foo import add
 
 def test_add():
     assert add(2, 3) == 5
-''')
+'''
+
+_SAMPLE_PY = b'''"""Sample Python file for testing."""
+
+class SampleClass:
+    """A sample class."""
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def greet(self) -> str:
+        """Return a greeting."""
+        return f"Hello, {self.name}!"
+
+def utility_function(data: list) -> int:
+    """Process data and return count."""
+    return len([x for x in data if x])
+
+# Module-level variable
+DEFAULT_NAME = "World"
+'''
+
+_ORIGINAL_PY = b'def old_func(): return "old"'
+_MODIFIED_PY = b'def func(): return 1'
+_DELETED_PY = b'def func(): return "delete me"'
+_MODIFIED_V2_PY = b'def func(): return 2'
+_NEW_PY = b'def new_func(): return "new"'
+
+# SHA256 digests (as used by CoreIndexer._get_file_hash) computed once at import
+_INITIAL_HASHES = {
+    name: hashlib.sha256(content).hexdigest()
+    for name, content in (
+        ("original.py", _ORIGINAL_PY),
+        ("modified.py", _MODIFIED_PY),
+        ("deleted.py", _DELETED_PY),
+    )
+}
+_CHANGED_HASHES = {
+    "modified.py": hashlib.sha256(_MODIFIED_V2_PY).hexdigest(),
+    "new.py": hashlib.sha256(_NEW_PY).hexdigest(),
+}
+
+
+# ---------------------------------------------------------------------------
+# Temporary repository fixture
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def _golden_repo(tmp_path_factory) -> Path:
+    """Build the sample repository tree once per session."""
+    repo_path = tmp_path_factory.mktemp("golden_repo")
+    
+    # Create sample Python files
+    (repo_path / "foo.py").write_bytes(_FOO_PY)
+    (repo_path / "bar.py").write_bytes(_BAR_PY)
+    
+    # Create a subdirectory with more code
+    subdir = repo_path / "utils"
+    subdir.mkdir()
+    (subdir / "__init__.py").write_bytes(b"")
+    (subdir / "helpers.py").write_bytes(_HELPERS_PY)
+    
+    # Create a test file (will be excluded by default)
+    test_dir = repo_path / "tests"
+    test_dir.mkdir()
+    (test_dir / "test_foo.py").write_bytes(_TEST_FOO_PY)
     
     return repo_path
 
 
+def _ram_tmp_root() -> str | None:
+    """Return a RAM-backed temp root (Linux /dev/shm) if one is writable."""
+    if sys.platform.startswith("linux") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None
+
+
+@pytest.fixture()
+def temp_repo(tmp_path_factory, _golden_repo) -> Iterator[Path]:
+    """Create a temporary repository with sample Python files for testing.
+    
+    On Linux the copy lives on tmpfs so the write/unlink/re-index churn in
+    these tests never waits on disk writeback.
+    """
+    ram_root = _ram_tmp_root()
+    if ram_root:
+        repo_path = Path(tempfile.mkdtemp(prefix="pytest-claude-indexer-", dir=ram_root))
+    else:
+        repo_path = tmp_path_factory.mktemp("sample_repo")
+    
+    # Copy rather than hardlink: tests rewrite files in place (O_TRUNC), which
+    # would leak their edits into the shared golden tree through a hardlink.
+    shutil.copytree(
+        _golden_repo, repo_path,
+        dirs_exist_ok=True, copy_function=shutil.copyfile
+    )
+    
+    yield repo_path
+    
+    # tmp_path_factory prunes its own directories; tmpfs copies are ours to remove
+    if ram_root:
+        shutil.rmtree(repo_path, ignore_errors=True)
+
+
 @pytest.fixture()
 def empty_repo(tmp_path_factory) -> Path:
     """Create an empty temporary repository."""
@@ -107,53 +197,107 @@ def empty_repo(tmp_path_factory) -> Path:
 # Test collection utilities
 # ---------------------------------------------------------------------------
 
+def xdist_worker_id() -> str:
+    """Return the pytest-xdist worker id, or "gw0" when not running distributed."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "gw0")
+
+
+def worker_collection_name(base_name: str) -> str:
+    """Generate a collection name unique to this xdist worker and call."""
+    return f"{base_name}_{xdist_worker_id()}_{uuid.uuid4().hex[:6]}"
+
+
+_collection_counter = itertools.count()
+
+
 def get_test_collection_name(base_name: str = "test_collection") -> str:
-    """Generate a unique test collection name with timestamp."""
-    import time
-    timestamp = int(time.time())
-    return f"{base_name}_{timestamp}"
+    """Generate a test collection name unique to this process and call.
+    
+    A counter rather than a timestamp: two calls within the same second
+    would otherwise get the same name.
+    """
+    return f"{base_name}_{os.getpid()}_{next(_collection_counter)}"
+
+
+PRODUCTION_COLLECTIONS = frozenset({
+    'claude-memory-test', 'memory-project', 'general', 
+    'watcher-test'  # Add watcher-test as it's used for debugging
+})
 
 
 def is_production_collection(collection_name: str) -> bool:
     """Check if a collection name is a production collection that should never be deleted."""
-    PRODUCTION_COLLECTIONS = {
-        'claude-memory-test', 'memory-project', 'general', 
-        'watcher-test'  # Add watcher-test as it's used for debugging
-    }
     return collection_name in PRODUCTION_COLLECTIONS
 
 
 # ---------------------------------------------------------------------------
-# Qdrant test fixtures
+# Configuration loading
 # ---------------------------------------------------------------------------
 
-@pytest.fixture(scope="session")
-def qdrant_client() -> Iterator[QdrantClient]:
-    """Create a Qdrant client for testing with session scope."""
-    # Load config to get API key from settings.txt
+@functools.lru_cache(maxsize=1)
+def _load_test_config() -> "IndexerConfig":
+    """Parse settings.txt once and share the result across the session."""
     from claude_indexer.config import load_config
-    config = load_config()
-    
+    return load_config()
+
+
+@pytest.fixture(scope="session")
+def loaded_config() -> "IndexerConfig":
+    """Provide the session-wide configuration loaded from settings.txt."""
+    return _load_test_config()
+
+
+# ---------------------------------------------------------------------------
+# Qdrant test fixtures
+# ---------------------------------------------------------------------------
+
+def _uses_memory_qdrant(config) -> bool:
+    """Whether the suite runs against in-process Qdrant (QDRANT_URL=:memory:)."""
+    return config.qdrant_url == ":memory:"
+
+
+def _qdrant_connection_kwargs(config) -> dict:
+    """Build Qdrant client connection arguments from the loaded config."""
+    if _uses_memory_qdrant(config):
+        return {"location": ":memory:"}
     # Use authentication if available
     if config.qdrant_api_key and config.qdrant_api_key != "default-key":
+        return {"url": config.qdrant_url, "api_key": config.qdrant_api_key}
+    # Fall back to unauthenticated for local testing
+    return {"host": "localhost", "port": 6333}
+
+
+# Test collections stay far below this, so Qdrant never builds HNSW graphs
+# for them and serves every search with an exact full scan.
+_TEST_INDEXING_THRESHOLD = 20000
+
+
+@pytest.fixture(scope="session")
+def qdrant_client(loaded_config) -> Iterator[QdrantClient]:
+    """Create a Qdrant client for testing with session scope."""
+    if _uses_memory_qdrant(loaded_config):
+        # Every fixture has to see the same in-process database
+        client = _memory_qdrant_store().client
+    else:
+        # qdrant-client turns keep-alive off for localhost, so every REST call
+        # reconnects; the session client keeps a small HTTP/2 pool open instead.
         client = QdrantClient(
-            url=config.qdrant_url,
-            api_key=config.qdrant_api_key
+            **_qdrant_connection_kwargs(loaded_config),
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=16),
+            timeout=60
         )
-    else:
-        # Fall back to unauthenticated for local testing
-        client = QdrantClient("localhost", port=6333)
     
-    # Create test collection with timestamp to ensure uniqueness and easy cleanup
-    collection_name = get_test_collection_name("test_collection")
+    # Create a uniquely named test collection for easy cleanup
+    collection_name = get_test_collection_name(f"test_collection_{xdist_worker_id()}")
     try:
-        collections = client.get_collections().collections
-        if not any(c.name == collection_name for c in collections):
+        existing_names = {c.name for c in client.get_collections().collections}
+        if collection_name not in existing_names:
             client.create_collection(
                 collection_name=collection_name,
                 vectors_config=VectorParams(size=1536, distance=Distance.COSINE),
                 optimizers_config={
-                    "indexing_threshold": 1000
+                    "indexing_threshold": _TEST_INDEXING_THRESHOLD
                 }
             )
     except Exception as e:
@@ -163,17 +307,22 @@ def qdrant_client() -> Iterator[QdrantClient]:
     
     # Cleanup: Remove ONLY temporary test collections after test session
     try:
-        collections = client.get_collections().collections
+        # Map each collection name to its lowercase form once
+        names = {c.name: c.name.lower() for c in client.get_collections().collections}
         # Only cleanup collections that are clearly temporary test collections  
         test_collections = [
-            c.name for c in collections 
-            if (c.name.startswith('test_') or  # test_ prefix
-                c.name.endswith('_test') or   # _test suffix  
-                'integration' in c.name.lower() or  # integration tests
-                'temp' in c.name.lower() or    # temporary collections
-                any(char.isdigit() for char in c.name)  # has numbers (likely timestamps)
-                ) and not is_production_collection(c.name)  # NEVER delete production collections
+            name for name, lower in names.items()
+            if (name.startswith('test_') or  # test_ prefix
+                name.endswith('_test') or   # _test suffix  
+                'integration' in lower or  # integration tests
+                'temp' in lower or    # temporary collections
+                any(char.isdigit() for char in name)  # has numbers (likely timestamps)
+                ) and not is_production_collection(name)  # NEVER delete production collections
         ]
+        if "PYTEST_XDIST_WORKER" in os.environ:
+            # Other workers may still be using theirs; only sweep our own
+            worker_tag = f"_{xdist_worker_id()}_"
+            test_collections = [name for name in test_collections if worker_tag in name]
         for collection_name in test_collections:
             try:
                 client.delete_collection(collection_name)
@@ -184,67 +333,143 @@ def qdrant_client() -> Iterator[QdrantClient]:
         print(f"Warning: Failed to cleanup test collections: {e}")
 
 
-@pytest.fixture()
-def qdrant_store(qdrant_client) -> "QdrantStore":
-    """Create a QdrantStore instance for testing."""
-    if QdrantStore is None:
-        pytest.skip("QdrantStore not available")
-    
-    # Load config to get API credentials 
-    from claude_indexer.config import load_config
-    config = load_config()
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_qdrant_client(loaded_config) -> AsyncIterator[AsyncQdrantClient]:
+    """Create a pooled async Qdrant client for bulk upsert/query tests.
     
-    store = QdrantStore(
-        url=config.qdrant_url,
-        api_key=config.qdrant_api_key if config.qdrant_api_key != "default-key" else None
+    Runs on the session event loop, so consuming tests need
+    ``@pytest.mark.asyncio(loop_scope="session")``.
+    """
+    client = AsyncQdrantClient(
+        **_qdrant_connection_kwargs(loaded_config), pool_size=100, timeout=60
     )
-    
-    # Clean up any existing test data
     try:
-        from qdrant_client.models import Filter, FieldCondition, MatchValue
-        filter_obj = Filter(
-            must=[FieldCondition(key="test", match=MatchValue(value=True))]
+        await client.get_collections()
+    except Exception as e:
+        await client.close()
+        pytest.skip(f"Qdrant not available: {e}")
+    
+    yield client
+    
+    await client.close()
+
+
+@functools.lru_cache(maxsize=1)
+def _memory_qdrant_store() -> "QdrantStore":
+    """The single in-process QdrantStore shared by every fixture in :memory: mode."""
+    from claude_indexer.storage.qdrant import QdrantStore
+    return QdrantStore(url=QdrantStore.IN_MEMORY_URL, indexing_threshold=_TEST_INDEXING_THRESHOLD)
+
+
+def _build_qdrant_store(config, prefer_grpc: bool = True) -> "QdrantStore":
+    """Construct a QdrantStore pointed at the configured test server.
+    
+    Tests make many small back-to-back calls, so gRPC is preferred; servers
+    that do not expose the gRPC port get a REST store instead. With
+    QDRANT_URL=:memory: every call returns the shared in-process store.
+    """
+    from claude_indexer.storage.qdrant import QdrantStore
+    
+    if _uses_memory_qdrant(config):
+        return _memory_qdrant_store()
+    
+    def build(grpc: bool) -> "QdrantStore":
+        return QdrantStore(
+            url=config.qdrant_url,
+            api_key=config.qdrant_api_key if config.qdrant_api_key != "default-key" else None,
+            prefer_grpc=grpc,
+            indexing_threshold=_TEST_INDEXING_THRESHOLD
         )
-        # Note: collection_name should be passed from fixture if needed
-        # For now, skip cleanup since we use timestamped collections
-        pass
-    except Exception:
-        # Skip cleanup if it fails
-        pass
     
-    return store
+    if prefer_grpc:
+        try:
+            return build(True)
+        except ConnectionError:
+            pass
+    return build(False)
+
+
+@pytest.fixture(scope="session")
+def qdrant_store(qdrant_client, loaded_config) -> "QdrantStore":
+    """Create one QdrantStore for the whole session.
+    
+    Tests isolate themselves by collection name, so the client connection is
+    set up once instead of per module. It talks gRPC where the server exposes
+    it, which the e2e indexing workflows rely on for their many small calls.
+    """
+    return _build_qdrant_store(loaded_config, prefer_grpc=True)
+
+
+@pytest.fixture()
+def worker_collection(qdrant_store):
+    """Factory for per-worker collection names, deleted again after the test."""
+    created = []
+    
+    def make(base_name: str) -> str:
+        name = worker_collection_name(base_name)
+        created.append(name)
+        return name
+    
+    yield make
+    
+    for name in created:
+        qdrant_store.delete_collection(name)
 
 
 # ---------------------------------------------------------------------------
 # Mock embedder fixtures
 # ---------------------------------------------------------------------------
 
+_VECTOR_POOL_SIZE = 4096  # Power of two so a hash maps to a row with a bit mask
+
+
+@functools.lru_cache(maxsize=None)
+def _vector_pool(dimension: int) -> np.ndarray:
+    """Draw a block of random vectors once per dimension for texts to index into."""
+    pool = np.random.default_rng(0).random(
+        (_VECTOR_POOL_SIZE, dimension), dtype=np.float32
+    )
+    pool.setflags(write=False)
+    return pool
+
+
+def _pool_row(text: str) -> int:
+    """Map a text to its row in the vector pool (str caches its own hash)."""
+    return hash(text) & (_VECTOR_POOL_SIZE - 1)
+
+
 class DummyEmbedder:
     """Fast, deterministic embedder for testing."""
     
-    def __init__(self, dimension: int = 1536):
+    def __init__(self, *args, dimension: int = 1536, **kwargs):
+        # Ignore OpenAIEmbedder constructor arguments so it can stand in for it
         self.dimension = dimension
     
+    def _embedding_matrix(self, texts: list[str]) -> np.ndarray:
+        """Gather embeddings for all texts as one (len(texts), dimension) block."""
+        rows = np.fromiter(map(_pool_row, texts), dtype=np.intp, count=len(texts))
+        return _vector_pool(self.dimension)[rows]
+    
     def embed_text(self, text: str):
         """Generate embedding for single text - interface compatibility."""
-        from claude_indexer.embeddings.base import EmbeddingResult
-        
-        # Create deterministic but unique embedding
-        seed = hash(text) % 10000
-        np.random.seed(seed)
-        embedding = np.random.rand(self.dimension).astype(np.float32).tolist()
-        
-        return EmbeddingResult(
-            text=text,
-            embedding=embedding,
-            model="dummy",
-            token_count=len(text.split()),
-            processing_time=0.001
-        )
+        return self.embed_batch([text])[0]
     
     def embed_batch(self, texts: list[str]):
         """Generate embeddings for multiple texts."""
-        return [self.embed_text(text) for text in texts]
+        from claude_indexer.embeddings.base import EmbeddingResult
+        
+        matrix = self._embedding_matrix(texts)
+        return [
+            EmbeddingResult(
+                text=text,
+                # Keep the float32 row: VectorPoint and PointStruct accept arrays
+                embedding=row,
+                model="dummy",
+                token_count=len(text.split()),
+                processing_time=0.001
+            )
+            for text, row in zip(texts, matrix)
+        ]
     
     def get_model_info(self):
         """Get model information."""
@@ -260,54 +485,83 @@ class DummyEmbedder:
     
     def embed_single(self, text: str) -> np.ndarray:
         """Legacy method for backward compatibility."""
-        result = self.embed_text(text)
-        return np.array(result.embedding, dtype=np.float32)
+        return _vector_pool(self.dimension)[_pool_row(text)]
     
     def embed(self, texts: list[str]) -> list[np.ndarray]:
         """Generate deterministic embeddings based on text hash."""
-        embeddings = []
-        for i, text in enumerate(texts):
-            # Create deterministic but unique embeddings
-            seed = hash(text) % 10000
-            np.random.seed(seed)
-            embedding = np.random.rand(self.dimension).astype(np.float32)
-            embeddings.append(embedding)
-        return embeddings
+        return list(self._embedding_matrix(texts))
+
+
+@functools.lru_cache(maxsize=None)
+def _constant_vector(dimension: int) -> np.ndarray:
+    """Shared read-only unit vector (non-zero so cosine distance stays defined)."""
+    vector = np.full(dimension, 1.0 / np.sqrt(dimension), dtype=np.float32)
+    vector.setflags(write=False)
+    return vector
+
+
+class ConstantEmbedder(DummyEmbedder):
+    """Embedder returning one shared vector for tests that ignore vector contents."""
+    
+    def embed_batch(self, texts: list[str]):
+        """Return the shared vector for every text without generating new ones."""
+        from claude_indexer.embeddings.base import EmbeddingResult
+        
+        embedding = _constant_vector(self.dimension)
+        return [
+            EmbeddingResult(
+                text=text,
+                embedding=embedding,
+                model="constant",
+                token_count=0,
+                processing_time=0.0
+            )
+            for text in texts
+        ]
+    
+    def embed_single(self, text: str) -> np.ndarray:
+        """Return a read-only view of the shared vector."""
+        return _constant_vector(self.dimension)
+    
+    def embed(self, texts: list[str]) -> list[np.ndarray]:
+        """Return the shared vector for every text."""
+        return [_constant_vector(self.dimension)] * len(texts)
 
 
 @pytest.fixture()
 def dummy_embedder() -> DummyEmbedder:
     """Provide a fast, deterministic embedder for tests."""
-    return DummyEmbedder()
+    embedder = DummyEmbedder()
+    # Tests re-embed the same lookup strings before and after each change
+    embedder.embed_single = functools.lru_cache(maxsize=256)(embedder.embed_single)
+    return embedder
+
+
+@pytest.fixture()
+def fast_embedder() -> ConstantEmbedder:
+    """Provide an allocation-free embedder for tests that never inspect vectors."""
+    return ConstantEmbedder()
 
 
 @pytest.fixture()
 def mock_openai_embedder(monkeypatch) -> DummyEmbedder:
-    """Mock OpenAI embedder with dummy implementation."""
-    dummy = DummyEmbedder()
-    
-    if OpenAIEmbedder is not None:
-        monkeypatch.setattr(OpenAIEmbedder, "embed_text", dummy.embed_text)
-        monkeypatch.setattr(OpenAIEmbedder, "embed_batch", dummy.embed_batch)
+    """Replace OpenAIEmbedder with DummyEmbedder wherever it gets constructed."""
+    # Patch the class at its import sites so new instances never hit the API
+    monkeypatch.setattr("claude_indexer.embeddings.openai.OpenAIEmbedder", DummyEmbedder)
+    monkeypatch.setattr("claude_indexer.embeddings.registry.OpenAIEmbedder", DummyEmbedder)
     
-    return dummy
+    return DummyEmbedder()
 
 
 # ---------------------------------------------------------------------------
 # Configuration fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture()
-def test_config(tmp_path) -> "IndexerConfig":
-    """Create test configuration with temporary paths."""
-    if IndexerConfig is None:
-        pytest.skip("IndexerConfig class not available")
-    
-    # Load real config from settings.txt and create test settings file
+def _build_test_config(directory: Path, real_config) -> "IndexerConfig":
+    """Write a settings file under ``directory`` and load a config isolated to it."""
     from claude_indexer.config import load_config
-    real_config = load_config()
     
-    settings_file = tmp_path / "test_settings.txt"
+    settings_file = directory / "test_settings.txt"
     settings_content = f"""
 openai_api_key={real_config.openai_api_key}
 qdrant_api_key={real_config.qdrant_api_key}
@@ -316,7 +570,7 @@ qdrant_url={real_config.qdrant_url}
     settings_file.write_text(settings_content.strip())
     
     # Create temporary state directory for test isolation
-    state_dir = tmp_path / "state"
+    state_dir = directory / "state"
     state_dir.mkdir(exist_ok=True)
     
     config = load_config(settings_file)
@@ -324,6 +578,78 @@ qdrant_url={real_config.qdrant_url}
     return config
 
 
+@pytest.fixture()
+def test_config(tmp_path, loaded_config) -> "IndexerConfig":
+    """Create test configuration with temporary paths."""
+    # Reuse the session config from settings.txt and create test settings file
+    return _build_test_config(tmp_path, loaded_config)
+
+
+@pytest.fixture()
+def make_indexer(request, qdrant_store, dummy_embedder):
+    """Factory for a dummy-embedder CoreIndexer writing to the shared store.
+    
+    ``make_indexer(collection, project_path=None, embedder=None, **config)``
+    indexes this test's ``temp_repo`` with ``dummy_embedder`` unless told
+    otherwise; extra keywords go to IndexerConfig.
+    """
+    from claude_indexer.config import IndexerConfig
+    from claude_indexer.indexer import CoreIndexer
+    
+    def make(collection_name: str, project_path: Path | None = None, embedder=None, **config_overrides) -> "CoreIndexer":
+        config = IndexerConfig(
+            collection_name=collection_name,
+            embedder_type="dummy",
+            storage_type="qdrant",
+            **config_overrides
+        )
+        return CoreIndexer(
+            config=config,
+            embedder=embedder or dummy_embedder,
+            vector_store=qdrant_store,
+            # Only copy the sample repo for tests that actually index it
+            project_path=project_path or request.getfixturevalue("temp_repo")
+        )
+    
+    return make
+
+
+# ---------------------------------------------------------------------------
+# Shared indexed corpus
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def preindexed_repo(tmp_path_factory, _golden_repo, qdrant_client, loaded_config):
+    """Index a copy of the sample repo once per session and yield ``(indexer, collection)``.
+    
+    Only for tests that read from the collection (search, count). Tests that
+    modify files or re-index must use ``temp_repo`` and their own collection.
+    """
+    from claude_indexer.indexer import CoreIndexer
+    
+    root = tmp_path_factory.mktemp("preindexed")
+    repo = root / "repo"
+    shutil.copytree(_golden_repo, repo, copy_function=shutil.copyfile)
+    
+    store = _build_qdrant_store(loaded_config)
+    indexer = CoreIndexer(
+        config=_build_test_config(root, loaded_config),
+        embedder=DummyEmbedder(),
+        vector_store=store,
+        project_path=repo
+    )
+    
+    collection = f"e2e_shared_{xdist_worker_id()}"
+    # Reuse the collection if an interrupted run left it populated
+    if store.count(collection) == 0:
+        result = indexer.index_project(collection)
+        assert result.success, f"Shared corpus indexing failed: {result.errors}"
+    
+    yield indexer, collection
+    
+    store.delete_collection(collection)
+
+
 # ---------------------------------------------------------------------------
 # File system fixtures
 # ---------------------------------------------------------------------------
@@ -332,25 +658,7 @@ qdrant_url={real_config.qdrant_url}
 def sample_python_file(tmp_path) -> Path:
     """Create a single sample Python file for testing."""
     py_file = tmp_path / "sample.py"
-    py_file.write_text('''"""Sample Python file for testing."""
-
-class SampleClass:
-    """A sample class."""
-    
-    def __init__(self, name: str):
-        self.name = name
-    
-    def greet(self) -> str:
-        """Return a greeting."""
-        return f"Hello, {self.name}!"
-
-def utility_function(data: list) -> int:
-    """Process data and return count."""
-    return len([x for x in data if x])
-
-# Module-level variable
-DEFAULT_NAME = "World"
-''')
+    py_file.write_bytes(_SAMPLE_PY)
     return py_file
 
 
@@ -362,38 +670,28 @@ def sample_files_with_changes(tmp_path) -> tuple[Path, dict]:
     
     # Original file
     original = repo / "original.py"
-    original.write_text('def old_func(): return "old"')
+    original.write_bytes(_ORIGINAL_PY)
     
     # File to be modified
     modified = repo / "modified.py"
-    modified.write_text('def func(): return 1')
+    modified.write_bytes(_MODIFIED_PY)
     
     # File to be deleted
     deleted = repo / "deleted.py"
-    deleted.write_text('def func(): return "delete me"')
+    deleted.write_bytes(_DELETED_PY)
     
     changes = {
-        "modify": (modified, 'def func(): return 2'),  # Changed return value
+        "modify": (modified, _MODIFIED_V2_PY.decode()),  # Changed return value
         "delete": deleted,
-        "add": (repo / "new.py", 'def new_func(): return "new"')
+        "add": (repo / "new.py", _NEW_PY.decode()),
+        # Precomputed digests so tests can compare without re-hashing
+        "expected_hashes": dict(_INITIAL_HASHES),
+        "changed_hashes": dict(_CHANGED_HASHES),
     }
     
     return repo, changes
 
 
-# ---------------------------------------------------------------------------
-# Async fixtures for file watching tests
-# ---------------------------------------------------------------------------
-
-@pytest.fixture()
-def event_loop():
-    """Create an event loop for async tests."""
-    import asyncio
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
-
-
 # ---------------------------------------------------------------------------
 # Marker decorators
 # ---------------------------------------------------------------------------
@@ -414,25 +712,26 @@ def requires_openai(func):
     )(func)
 
 
+@functools.lru_cache(maxsize=1)
 def _qdrant_available() -> bool:
-    """Check if Qdrant is available."""
+    """Check if Qdrant is available (probed once per session)."""
     try:
-        # Load config to get API key from settings.txt
-        from claude_indexer.config import load_config
-        config = load_config()
+        # Reuse the cached settings.txt config shared with the fixtures
+        connection = _qdrant_connection_kwargs(_load_test_config())
         
-        # Use authentication if available
-        if config.qdrant_api_key and config.qdrant_api_key != "default-key":
-            client = QdrantClient(
-                url=config.qdrant_url,
-                api_key=config.qdrant_api_key
-            )
-        else:
-            # Fall back to unauthenticated for local testing
-            client = QdrantClient("localhost", port=6333)
-            
-        client.get_collections()
-        return True
+        if "location" in connection:
+            return True  # In-process, nothing to reach
+        
+        if "url" in connection:
+            # Configured remote instance: a real call also validates the API key
+            QdrantClient(**connection).get_collections()
+            return True
+        
+        # Local instance: an open port is enough, skip the REST round-trip
+        with socket.create_connection(
+            (connection["host"], connection["port"]), timeout=0.1
+        ):
+            return True
     except Exception:
         return False
 
@@ -442,39 +741,34 @@ def _qdrant_available() -> bool:
 # ---------------------------------------------------------------------------
 
 @pytest.fixture(autouse=False, scope="function")  # DISABLED - was deleting production collections
-def cleanup_test_collections_on_failure():
+def cleanup_test_collections_on_failure(loaded_config):
     """Cleanup test collections after each test function to prevent accumulation."""
     yield  # Run the test
     
+    # Under pytest-xdist only one worker sweeps the shared Qdrant instance
+    if xdist_worker_id() != "gw0":
+        return
+    
     # Only perform cleanup if Qdrant is available
     if not _qdrant_available():
         return
     
     # Cleanup any collections created during this test that match test patterns
     try:
-        from claude_indexer.config import load_config
-        config = load_config()
-        
-        if config.qdrant_api_key and config.qdrant_api_key != "default-key":
-            client = QdrantClient(
-                url=config.qdrant_url,
-                api_key=config.qdrant_api_key
-            )
-        else:
-            client = QdrantClient("localhost", port=6333)
+        client = QdrantClient(**_qdrant_connection_kwargs(loaded_config))
         
-        collections = client.get_collections().collections
+        names = {c.name: c.name.lower() for c in client.get_collections().collections}
         # Only cleanup collections that look like temporary test collections
         # PRODUCTION SAFEGUARD: Use centralized production collection check
         temp_test_collections = [
-            c.name for c in collections 
-            if (not is_production_collection(c.name) and 
-                ('test' in c.name.lower() and 
-                (any(char.isdigit() for char in c.name) or  # has numbers (likely timestamps)
-                 c.name.startswith('test_') or  # any test collection
-                 c.name.endswith('_test') or   # reverse pattern
-                 'integration' in c.name.lower() or  # integration tests
-                 'delete' in c.name.lower())))  # deletion tests
+            name for name, lower in names.items()
+            if (not is_production_collection(name) and 
+                ('test' in lower and 
+                (any(char.isdigit() for char in name) or  # has numbers (likely timestamps)
+                 name.startswith('test_') or  # any test collection
+                 name.endswith('_test') or   # reverse pattern
+                 'integration' in lower or  # integration tests
+                 'delete' in lower)))  # deletion tests
         ]
         
         for collection_name in temp_test_collections:
@@ -502,7 +796,34 @@ def assert_valid_embedding(embedding: np.ndarray, expected_dim: int = 1536):
 
 def count_python_files(path: Path) -> int:
     """Count Python files in a directory recursively."""
-    return len(list(path.rglob("*.py")))
+    return sum(1 for _ in path.rglob("*.py"))
+
+
+def write_tree(root: Path, files: dict[str, str]) -> list[Path]:
+    """Write ``{relative_path: text}`` under root with one tar extraction."""
+    import io
+    import tarfile
+    import time
+    
+    # Stamp members with the current time so they look like freshly written files
+    now = time.time()
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as archive:
+        for name, text in files.items():
+            data = text.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = now
+            archive.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    
+    with tarfile.open(fileobj=buffer, mode="r") as archive:
+        # The data filter (3.12, backported to security releases) rejects unsafe members
+        if hasattr(tarfile, "data_filter"):
+            archive.extractall(root, filter="data")
+        else:
+            archive.extractall(root)
+    return [root / name for name in files]
 
 
 def wait_for_eventual_consistency(
@@ -590,6 +911,39 @@ def wait_for_eventual_consistency(
     return False
 
 
+def truncate_collection(qdrant_store, collection_name: str) -> None:
+    """Delete every point in a collection while keeping its config and indexes."""
+    try:
+        qdrant_store.client.delete(
+            collection_name=collection_name,
+            points_selector=FilterSelector(filter=Filter(must=[])),
+            wait=True
+        )
+    except Exception:
+        pass  # Collection does not exist yet
+
+
+def file_has_points(qdrant_store, collection_name: str, file_path) -> bool:
+    """Check whether any point still belongs to a file.
+    
+    Matches file_path or the File entity name, like delete_by_files, through
+    the keyword payload index: a scroll of one id, with no embedding or ANN
+    search and no top-k cutoff to hide leftovers.
+    """
+    path = str(file_path)
+    points, _ = qdrant_store.client.scroll(
+        collection_name=collection_name,
+        scroll_filter=Filter(should=[
+            FieldCondition(key="file_path", match=MatchValue(value=path)),
+            FieldCondition(key="entity_name", match=MatchValue(value=path)),
+        ]),
+        limit=1,
+        with_payload=False,
+        with_vectors=False
+    )
+    return bool(points)
+
+
 def wait_for_collection_ready(
     qdrant_store,
     collection_name: str,
@@ -647,6 +1001,14 @@ def wait_for_collection_ready(
     return False
 
 
+def hit_names(hits) -> frozenset:
+    """Distinct ``entity_name`` payload values across search hits, relations excluded."""
+    return frozenset(
+        hit.payload.get("entity_name", "") for hit in hits
+        if hit.payload.get("chunk_type", "") != "relation"
+    )
+
+
 def verify_entity_searchable(
     qdrant_store,
     dummy_embedder,
@@ -688,28 +1050,18 @@ def verify_entity_searchable(
         # Enhanced matching logic for unique entity name matches only
         # Focus on entities that have the search term in their actual name
         # This provides more precise matching for test expectations
-        unique_entity_names = set()
-        matching_hits = []
-        
-        for hit in hits:
-            chunk_type = hit.payload.get("chunk_type", "")
-            entity_name_field = hit.payload.get("entity_name", "")
-            
-            # Skip relations and file paths
-            if chunk_type == "relation" or entity_name_field.startswith("/"):
-                continue
-                
-            # Only match if search term is in the entity name (not just content)
-            if entity_name in entity_name_field:
-                if entity_name_field not in unique_entity_names:
-                    unique_entity_names.add(entity_name_field)
-                    matching_hits.append(hit)
-                    if verbose:
-                        print(f"DEBUG: Unique entity match - entity_name='{entity_name_field}', chunk_type='{chunk_type}'")
+        names = hit_names(hits)
+        matching_names = sorted(
+            name for name in names
+            # Skip file paths; only match the search term in the entity name (not just content)
+            if entity_name in name and not name.startswith("/")
+        )
         
         if verbose:
-            print(f"DEBUG: Found {len(matching_hits)} unique entity matches for '{entity_name}'")
-        return matching_hits
+            for name in matching_names:
+                print(f"DEBUG: Unique entity match - entity_name='{name}'")
+            print(f"DEBUG: Found {len(matching_names)} unique entity matches for '{entity_name}'")
+        return matching_names
     
     return wait_for_eventual_consistency(
         search_for_entity,
@@ -6,72 +6,177 @@ with the underlying indexing system.
 """
 
 import pytest
-import subprocess
-import sys
 import json
+import os
+import shutil
 import time
 from pathlib import Path
-from unittest.mock import patch, Mock
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch
 
-try:
-    from claude_indexer import cli_full as cli
-    CLI_AVAILABLE = True
-except ImportError:
-    CLI_AVAILABLE = False
-    cli = None
 from claude_indexer.config import IndexerConfig
+from claude_indexer.embeddings.base import EmbeddingResult
+from claude_indexer.indexer import CoreIndexer
+from claude_indexer.storage.base import StorageResult
+from tests.conftest import DummyEmbedder, file_has_points
+
+# Probe the CLI stack once for the whole module. Drive commands in-process
+# with CliRunner.invoke rather than spawning `python -m claude_indexer`
+# through subprocess, which pays a full interpreter start per call.
+cli = pytest.importorskip("claude_indexer.cli_full")
+CliRunner = pytest.importorskip("click.testing").CliRunner
+
+
+def _hit_label(hit) -> str:
+    """First non-empty of the entity name, name or content payload fields."""
+    payload = hit.payload
+    return payload.get("entity_name", "") or payload.get("name", "") or payload.get("content", "")
+
+
+class ThirdTextFailsEmbedder(DummyEmbedder):
+    """DummyEmbedder that fails the third text it is ever asked to embed."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.texts_seen = 0
+        self.failures = 0
+    
+    def embed_batch(self, texts: list[str]):
+        results = super().embed_batch(texts)
+        third = 2 - self.texts_seen  # Position of the third text overall in this batch
+        self.texts_seen += len(texts)
+        if 0 <= third < len(results):
+            # Fail per item, like a real embedder, so the rest of the batch survives
+            results[third] = EmbeddingResult(text=texts[third], embedding=[], error="Simulated embedding failure")
+            self.failures += 1
+        return results
+
+
+@pytest.fixture(scope="module")
+def indexer_config(tmp_path_factory, loaded_config) -> IndexerConfig:
+    """Indexer config shared by the workflow tests in this module.
+    
+    State files are keyed by collection name and every test indexes into
+    its own worker_collection, so one state directory is safe to share.
+    """
+    from tests.conftest import _build_test_config
+    return _build_test_config(tmp_path_factory.mktemp("e2e_config"), loaded_config)
+
+
+@pytest.fixture(scope="module")
+def success_result():
+    """Successful indexing result handed back by mocked CoreIndexer instances."""
+    return SimpleNamespace(
+        success=True,
+        processing_time=1.5,
+        files_processed=2,
+        entities_created=5,
+        relations_created=3,
+        implementation_chunks_created=4,
+        warnings=[],
+        errors=[],
+        # Cost tracking fields are compared numerically by the CLI
+        total_tokens=0,
+        total_cost_estimate=0.0,
+        embedding_requests=0
+    )
+
+
+@pytest.fixture(scope="session")
+def large_project_template(tmp_path_factory):
+    """Build the 50-file simulated project once per session."""
+    project_root = tmp_path_factory.mktemp("large_project_template")
+    
+    # Create multiple modules with various content types
+    for module_i in range(10):
+        module_dir = project_root / f"module_{module_i}"
+        module_dir.mkdir()
+        
+        # Create Python files in each module
+        for file_i in range(5):
+            parts = [f'"""Module {module_i} file {file_i}."""\n\n']
+            
+            # Add classes
+            for class_i in range(3):
+                parts.append(f'''
+class Module{module_i}Class{class_i}:
+    """Class {class_i} in module {module_i}."""
+    
+    def method_{class_i}(self):
+        """Method {class_i}."""
+        return "module_{module_i}_class_{class_i}"
+''')
+            
+            # Add functions
+            for func_i in range(2):
+                parts.append(f'''
+
+def module_{module_i}_function_{func_i}():
+    """Function {func_i} in module {module_i}."""
+    return {module_i} * {func_i}
+''')
+            
+            (module_dir / f"file_{file_i}.py").write_text("".join(parts))
+    
+    return project_root
+
+
+@pytest.fixture(scope="class")
+def runner():
+    """Click test runner shared by the CLI tests in a class.
+    
+    Click 8.2+ always captures stderr separately, so there is no
+    ``mix_stderr`` switch to turn off.
+    """
+    return CliRunner()
+
+
+@pytest.fixture(scope="session")
+def cli_help_outputs():
+    """Render the root and index help pages once per session."""
+    outputs = {}
+    for key, args in (("root", ['--help']), ("index", ['index', '--help'])):
+        result = CliRunner().invoke(cli.cli, args, catch_exceptions=False)
+        assert result.exit_code == 0, result.output
+        outputs[key] = result.output
+    return outputs
+
+
+@pytest.fixture(scope="session")
+def cli_mode_outputs():
+    """Index command output keyed by output-mode flag, filled in by test_cli_output_mode."""
+    return {}
 
 
 @pytest.mark.e2e
 class TestCLIEndToEnd:
     """Test complete CLI workflows."""
     
-    def test_basic_cli_indexing_workflow(self, temp_repo, qdrant_store):
+    def test_basic_cli_indexing_workflow(self, cli_help_outputs):
         """Test basic CLI indexing from command line."""
-        if not CLI_AVAILABLE:
-            pytest.skip("CLI not available (Click or dependencies missing)")
-        
-        # Test CLI help command
-        from click.testing import CliRunner
-        runner = CliRunner()
-        
         # Test main CLI help
-        result = runner.invoke(cli.cli, ['--help'])
-        assert result.exit_code == 0
-        assert "Claude Code Memory Indexer" in result.output
+        assert "Claude Code Memory Indexer" in cli_help_outputs["root"]
         
         # Test index command help
-        result = runner.invoke(cli.cli, ['index', '--help'])
-        assert result.exit_code == 0
-        assert "Index an entire project" in result.output
+        assert "Index an entire project" in cli_help_outputs["index"]
     
-    def test_cli_index_command_with_mocked_components(self, temp_repo):
+    def test_cli_index_command_with_mocked_components(self, temp_repo, success_result, runner):
         """Test CLI index command with mocked dependencies."""
-        if not CLI_AVAILABLE:
-            pytest.skip("CLI not available (Click or dependencies missing)")
-            
-        from click.testing import CliRunner
-        
-        runner = CliRunner()
+        # Mock file operations to prevent path errors
+        mock_file = Mock()
+        mock_file.__enter__ = Mock(return_value=mock_file)
+        mock_file.__exit__ = Mock(return_value=None)
         
         # Mock the core components to avoid external dependencies
-        with patch('claude_indexer.cli_full.CoreIndexer') as mock_indexer_class:
+        with patch.multiple(
+            'claude_indexer.cli_full',
+            CoreIndexer=DEFAULT,
+            create_embedder_from_config=DEFAULT,
+            create_store_from_config=DEFAULT
+        ) as mocks, patch('builtins.open', Mock(return_value=mock_file)), patch('json.dump', Mock()):
             # Configure mock indexer
             mock_indexer = Mock()
-            mock_result = Mock()
-            mock_result.success = True
-            mock_result.processing_time = 1.5
-            mock_result.files_processed = 2
-            mock_result.entities_created = 5
-            mock_result.relations_created = 3
-            mock_result.implementation_chunks_created = 4  # Add missing attribute
-            mock_result.warnings = []
-            mock_result.errors = []
-            # Add missing cost tracking attributes to prevent Mock comparison errors
-            mock_result.total_tokens = 0
-            mock_result.total_cost_estimate = 0.0
-            mock_result.embedding_requests = 0
-            mock_indexer.index_project.return_value = mock_result
+            mock_indexer.index_project.return_value = success_result
             # Fix: Mock _categorize_file_changes to return empty lists instead of Mock objects
             mock_indexer._categorize_file_changes.return_value = ([], [], [])
             # Fix: Mock other methods that might return iterables
@@ -102,88 +207,59 @@ class TestCLIEndToEnd:
             mock_client.count.return_value = mock_count_result
             mock_indexer.vector_store.backend.client = mock_client
             mock_indexer.vector_store.client = mock_client
-            mock_indexer_class.return_value = mock_indexer
+            mocks['CoreIndexer'].return_value = mock_indexer
+            
+            # Test index command
+            result = runner.invoke(cli.cli, [
+                'index',
+                '--project', str(temp_repo),
+                '--collection', 'test-collection'
+            ], catch_exceptions=False)
             
-            # Mock embedder and store creation
-            with patch('claude_indexer.cli_full.create_embedder_from_config') as mock_embedder:
-                with patch('claude_indexer.cli_full.create_store_from_config') as mock_store:
-                    # Mock file operations to prevent path errors
-                    mock_file = Mock()
-                    mock_file.__enter__ = Mock(return_value=mock_file)
-                    mock_file.__exit__ = Mock(return_value=None)
-                    with patch('builtins.open', Mock(return_value=mock_file)):
-                        with patch('json.dump', Mock()):
-                            mock_embedder.return_value = Mock()
-                            mock_store.return_value = Mock()
-                            
-                            # Test index command
-                            result = runner.invoke(cli.cli, [
-                                'index',
-                                '--project', str(temp_repo),
-                                '--collection', 'test-collection'
-                            ])
-                            
-                            # Should succeed and call indexer
-                            if result.exit_code != 0:
-                                print(f"Exit code: {result.exit_code}")
-                                print(f"Output: {result.output}")
-                                print(f"Exception: {result.exception}")
-                            assert result.exit_code == 0
-                            assert mock_indexer.index_project.called
+            # Should succeed and call indexer
+            assert result.exit_code == 0, f"{result.output}\n{result.exception}"
+            assert mock_indexer.index_project.called
     
-    def test_cli_search_command(self, temp_repo):
+    def test_cli_search_command(self, temp_repo, runner):
         """Test CLI search functionality."""
-        try:
-            import click
-            from click.testing import CliRunner
-        except ImportError:
-            pytest.skip("Click not available for CLI testing")
-        
-        runner = CliRunner()
-        
         # Mock search components
-        with patch('claude_indexer.cli_full.create_embedder_from_config') as mock_embedder_factory:
-            with patch('claude_indexer.cli_full.create_store_from_config') as mock_store_factory:
-                with patch('claude_indexer.cli_full.CoreIndexer') as mock_indexer_class:
-                    # Configure mock embedder
-                    mock_embedder = Mock()
-                    mock_embedder.embed_single.return_value = [0.1] * 1536
-                    mock_embedder_factory.return_value = mock_embedder
-                    
-                    # Configure mock store
-                    mock_store = Mock()
-                    mock_store_factory.return_value = mock_store
-                    
-                    # Configure mock indexer with search results
-                    mock_indexer = Mock()
-                    search_results = [
-                        {"payload": {"name": "test_function", "file_path": "test.py", "line": 10}, "score": 0.95}
-                    ]
-                    mock_indexer.search_similar.return_value = search_results
-                    mock_indexer_class.return_value = mock_indexer
-                
-                    # Test search command
-                    result = runner.invoke(cli.cli, [
-                        'search',
-                        '--project', str(temp_repo),
-                        '--collection', 'test-collection',
-                        'test function'
-                    ])
-                    
-                    assert result.exit_code == 0
-                    assert "test_function" in result.output
-                    assert mock_indexer.search_similar.called
+        with patch.multiple(
+            'claude_indexer.cli_full',
+            CoreIndexer=DEFAULT,
+            create_embedder_from_config=DEFAULT,
+            create_store_from_config=DEFAULT
+        ) as mocks:
+            # Configure mock embedder
+            mock_embedder = Mock()
+            mock_embedder.embed_single.return_value = [0.1] * 1536
+            mocks['create_embedder_from_config'].return_value = mock_embedder
+            
+            # Configure mock store
+            mock_store = Mock()
+            mocks['create_store_from_config'].return_value = mock_store
+            
+            # Configure mock indexer with search results
+            mock_indexer = Mock()
+            search_results = [
+                {"payload": {"name": "test_function", "file_path": "test.py", "line": 10}, "score": 0.95}
+            ]
+            mock_indexer.search_similar.return_value = search_results
+            mocks['CoreIndexer'].return_value = mock_indexer
+            
+            # Test search command
+            result = runner.invoke(cli.cli, [
+                'search',
+                '--project', str(temp_repo),
+                '--collection', 'test-collection',
+                'test function'
+            ])
+            
+            assert result.exit_code == 0, result.output
+            assert b"test_function" in result.stdout_bytes
+            assert mock_indexer.search_similar.called
     
-    def test_cli_config_validation(self, temp_repo):
+    def test_cli_config_validation(self, temp_repo, runner):
         """Test CLI configuration validation."""
-        try:
-            import click
-            from click.testing import CliRunner
-        except ImportError:
-            pytest.skip("Click not available for CLI testing")
-        
-        runner = CliRunner()
-        
         # Test missing required arguments
         result = runner.invoke(cli.cli, ['index'])
         assert result.exit_code != 0  # Should fail due to missing required args
@@ -201,33 +277,44 @@ class TestCLIEndToEnd:
 class TestFullSystemWorkflows:
     """Test complete system workflows with real components."""
     
-    def test_index_and_search_workflow(self, temp_repo, dummy_embedder, qdrant_store, test_config):
+    def test_index_and_search_workflow(self, preindexed_repo):
         """Test complete index -> search workflow."""
-        config = test_config
+        indexer, collection = preindexed_repo
+        
+        # The shared corpus fixture has already indexed the project
+        assert indexer.vector_store.count(collection) >= 3
         
-        # Step 1: Index the project
-        from claude_indexer.indexer import CoreIndexer
+        # Search for indexed content with eventual consistency
+        from tests.conftest import verify_entity_searchable
+        add_function_found = verify_entity_searchable(
+            indexer.vector_store, indexer.embedder, collection,
+            "add", timeout=10.0, verbose=True, expected_count=2
+        )
+        assert add_function_found
+    
+    def test_index_modify_and_search_workflow(self, preindexed_repo, tmp_path_factory, dummy_embedder, qdrant_store, indexer_config, worker_collection):
+        """Test index -> modify -> re-index -> search on a private copy of the corpus."""
+        shared_indexer, _ = preindexed_repo
+        
+        # Mutate a copy: the session-shared corpus must stay read-only
+        repo = tmp_path_factory.mktemp("mut") / "repo"
+        shutil.copytree(shared_indexer.project_path, repo, copy_function=shutil.copyfile)
+        collection = worker_collection("test_e2e_workflow")
+        
+        # Step 1: Index the copied project
         indexer = CoreIndexer(
-            config=config,
+            config=indexer_config,
             embedder=dummy_embedder,
             vector_store=qdrant_store,
-            project_path=temp_repo
+            project_path=repo
         )
         
-        result = indexer.index_project("test_e2e_workflow")
+        result = indexer.index_project(collection)
         assert result.success
         assert result.entities_created >= 3
         
-        # Step 2: Search for indexed content with eventual consistency
-        from tests.conftest import verify_entity_searchable
-        add_function_found = verify_entity_searchable(
-            qdrant_store, dummy_embedder, "test_e2e_workflow",
-            "add", timeout=10.0, verbose=True, expected_count=2
-        )
-        assert add_function_found
-        
-        # Step 3: Modify files and re-index
-        new_file = temp_repo / "new_module.py"
+        # Step 2: Modify files and re-index the already indexed corpus
+        new_file = repo / "new_module.py"
         new_file.write_text('''"""New module added during test."""
 
 def search_test_function():
@@ -235,21 +322,22 @@ def search_test_function():
     return "searchable"
 ''')
         
-        result2 = indexer.index_project("test_e2e_workflow")
+        result2 = indexer.index_project(collection)
         assert result2.success
         
-        # Step 4: Search for new content with eventual consistency
+        # Step 3: Search for new content with eventual consistency
+        from tests.conftest import verify_entity_searchable
         new_function_found = verify_entity_searchable(
-            qdrant_store, dummy_embedder, "test_e2e_workflow",
+            qdrant_store, dummy_embedder, collection,
             "search_test_function", timeout=10.0, verbose=True
         )
         assert new_function_found
     
-    def test_incremental_indexing_workflow(self, temp_repo, dummy_embedder, qdrant_store, test_config):
+    def test_incremental_indexing_workflow(self, temp_repo, dummy_embedder, qdrant_store, indexer_config, worker_collection):
         """Test incremental indexing maintains consistency."""
-        config = test_config
+        config = indexer_config
+        collection = worker_collection("test_incremental_e2e")
         
-        from claude_indexer.indexer import CoreIndexer
         indexer = CoreIndexer(
             config=config,
             embedder=dummy_embedder,
@@ -258,51 +346,39 @@ def search_test_function():
         )
         
         # Initial index
-        result1 = indexer.index_project("test_incremental_e2e")
-        initial_count = qdrant_store.count("test_incremental_e2e")
+        result1 = indexer.index_project(collection)
+        initial_count = qdrant_store.count(collection)
         
         # First incremental run (no changes)
-        result2 = indexer.index_project("test_incremental_e2e")
+        result2 = indexer.index_project(collection)
         assert result2.success
-        assert qdrant_store.count("test_incremental_e2e") == initial_count  # Should be same
+        assert qdrant_store.count(collection) == initial_count  # Should be same
         
         # Add a file (use a name that won't be filtered as a test file)
         new_file = temp_repo / "additional_module.py"
         new_file.write_text('def incremental_func(): return "incremental"')
         
         # Second incremental run (with changes)
-        result3 = indexer.index_project("test_incremental_e2e")
+        result3 = indexer.index_project(collection)
         assert result3.success
-        assert qdrant_store.count("test_incremental_e2e") > initial_count  # Should increase
+        assert qdrant_store.count(collection) > initial_count  # Should increase
         
         # Verify new content is searchable with eventual consistency
         from tests.conftest import verify_entity_searchable
         incremental_found = verify_entity_searchable(
-            qdrant_store, dummy_embedder, "test_incremental_e2e",
+            qdrant_store, dummy_embedder, collection,
             "incremental_func", timeout=10.0, verbose=True
         )
         assert incremental_found
     
-    def test_error_recovery_workflow(self, temp_repo, qdrant_store, test_config):
+    def test_error_recovery_workflow(self, temp_repo, qdrant_store, indexer_config, worker_collection):
         """Test system recovery from various error conditions."""
-        config = test_config
-        
-        # Create an embedder that fails sometimes
-        failing_embedder = Mock()
-        call_count = 0
-        
-        def sometimes_failing_embed(text):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 3:  # Fail on third call
-                raise Exception("Simulated embedding failure")
-            # Return valid embedding for other calls
-            import numpy as np
-            return np.random.rand(1536).astype(np.float32)
+        config = indexer_config
+        collection = worker_collection("test_error_recovery")
         
-        failing_embedder.embed_text.side_effect = sometimes_failing_embed
+        # An embedder that fails one text partway through the first run
+        failing_embedder = ThirdTextFailsEmbedder()
         
-        from claude_indexer.indexer import CoreIndexer
         indexer = CoreIndexer(
             config=config,
             embedder=failing_embedder,
@@ -310,59 +386,30 @@ def search_test_function():
             project_path=temp_repo
         )
         
-        # Should handle partial failures gracefully
-        result = indexer.index_project("test_error_recovery")
+        # First pass: one embedding fails and Qdrant then rejects the upsert
+        storage_outage = StorageResult(success=False, operation="upsert", errors=["Simulated storage outage"])
+        with patch.object(qdrant_store, "batch_upsert", return_value=storage_outage):
+            result = indexer.index_project(collection)
+        assert not result.success  # Should complete without crashing, reporting the failure
+        assert failing_embedder.failures == 1  # The partial failure was actually hit
         
-        # System should be resilient to individual failures
-        # (exact behavior depends on error handling implementation)
-        assert isinstance(result.success, bool)  # Should complete without crashing
-        
-        # Should be able to recover and continue
-        call_count = 0  # Reset for successful run
-        result2 = indexer.index_project("test_error_recovery")
+        # Recovery: nothing was stored, so nothing may be recorded as indexed
+        # and the re-run has to pick every file up again
+        result2 = indexer.index_project(collection)
         assert result2.success
+        assert result2.files_processed > 0
+        source_files = [temp_repo / "foo.py", temp_repo / "bar.py", temp_repo / "utils" / "helpers.py"]
+        assert all(file_has_points(qdrant_store, collection, f) for f in source_files), "Every source file should be stored after recovery"
     
-    def test_large_project_workflow(self, tmp_path, dummy_embedder, qdrant_store, test_config):
+    def test_large_project_workflow(self, tmp_path, large_project_template, dummy_embedder, qdrant_store, indexer_config, worker_collection):
         """Test workflow with a larger simulated project."""
-        config = test_config
+        config = indexer_config
+        collection = worker_collection("test_large_project")
         
-        # Create a larger project structure
+        # Hardlink the session template; this test only reads the files
         project_root = tmp_path / "large_project"
-        project_root.mkdir()
-        
-        # Create multiple modules with various content types
-        for module_i in range(10):
-            module_dir = project_root / f"module_{module_i}"
-            module_dir.mkdir()
-            
-            # Create Python files in each module
-            for file_i in range(5):
-                py_file = module_dir / f"file_{file_i}.py"
-                content = f'"""Module {module_i} file {file_i}."""\n\n'
-                
-                # Add classes
-                for class_i in range(3):
-                    content += f'''
-class Module{module_i}Class{class_i}:
-    """Class {class_i} in module {module_i}."""
-    
-    def method_{class_i}(self):
-        """Method {class_i}."""
-        return "module_{module_i}_class_{class_i}"
-'''
-                
-                # Add functions
-                for func_i in range(2):
-                    content += f'''
-
-def module_{module_i}_function_{func_i}():
-    """Function {func_i} in module {module_i}."""
-    return {module_i} * {func_i}
-'''
-                
-                py_file.write_text(content)
+        shutil.copytree(large_project_template, project_root, copy_function=os.link)
         
-        from claude_indexer.indexer import CoreIndexer
         indexer = CoreIndexer(
             config=config,
             embedder=dummy_embedder,
@@ -371,7 +418,7 @@ def module_{module_i}_function_{func_i}():
         )
         
         # Should handle large project efficiently
-        result = indexer.index_project("test_large_project")
+        result = indexer.index_project(collection)
         assert result.success
         
         # Should create substantial number of entities
@@ -385,12 +432,8 @@ def module_{module_i}_function_{func_i}():
             search_embedding = dummy_embedder.embed_single("Module0Class0")
             # Use top_k=300 for large project to ensure we find all target entities
             # With 50 files * ~17 entities per file = ~850 total entities, we need sufficient search scope
-            hits = qdrant_store.search("test_large_project", search_embedding, top_k=300)
-            matching_hits = [
-                hit for hit in hits 
-                if "Module0Class0" in (hit.payload.get("entity_name", "") or hit.payload.get("name", "") or hit.payload.get("content", ""))
-            ]
-            return matching_hits
+            hits = qdrant_store.search(collection, search_embedding, top_k=300)
+            return [hit for hit in hits if "Module0Class0" in _hit_label(hit)]
         
         # For large projects, just verify that Module0Class0 entities are found (no exact count requirement)
         # The system successfully indexes all entities, DummyEmbedder just ranks them differently
@@ -399,7 +442,7 @@ def module_{module_i}_function_{func_i}():
         
         # Verify the entities are properly structured 
         for entity in matching_entities[:3]:  # Check first 3 found entities
-            assert "Module0Class0" in (entity.payload.get("entity_name", "") or entity.payload.get("name", "") or entity.payload.get("content", ""))
+            assert "Module0Class0" in _hit_label(entity)
             assert "module_0" in entity.payload.get("file_path", "")
             # Entity type should be either "class" or "entity" depending on storage implementation
             entity_type = entity.payload.get("entity_type", entity.payload.get("type", entity.payload.get("entityType", "")))
@@ -410,14 +453,8 @@ def module_{module_i}_function_{func_i}():
 class TestCLIIntegrationScenarios:
     """Test CLI integration with various real-world scenarios."""
     
-    def test_cli_with_configuration_file(self, temp_repo, tmp_path):
+    def test_cli_with_configuration_file(self, temp_repo, tmp_path, success_result, runner):
         """Test CLI with custom configuration file."""
-        try:
-            import click
-            from click.testing import CliRunner
-        except ImportError:
-            pytest.skip("Click not available for CLI testing")
-        
         # Create a test configuration file with real API keys
         from claude_indexer.config import load_config
         real_config = load_config()
@@ -431,24 +468,19 @@ class TestCLIIntegrationScenarios:
         }
         config_file.write_text(json.dumps(config_content))
         
-        runner = CliRunner()
-        
-        with patch('claude_indexer.cli_full.CoreIndexer') as mock_indexer_class:
+        # Mock file operations to prevent path errors
+        mock_file = Mock()
+        mock_file.__enter__ = Mock(return_value=mock_file)
+        mock_file.__exit__ = Mock(return_value=None)
+        
+        with patch.multiple(
+            'claude_indexer.cli_full',
+            CoreIndexer=DEFAULT,
+            create_embedder_from_config=DEFAULT,
+            create_store_from_config=DEFAULT
+        ) as mocks, patch('builtins.open', Mock(return_value=mock_file)), patch('json.dump', Mock()):
             mock_indexer = Mock()
-            mock_result = Mock()
-            mock_result.success = True
-            mock_result.processing_time = 1.5
-            mock_result.files_processed = 2
-            mock_result.entities_created = 5
-            mock_result.relations_created = 3
-            mock_result.implementation_chunks_created = 4  # Add missing attribute
-            mock_result.warnings = []
-            mock_result.errors = []
-            # Add missing cost tracking attributes to prevent Mock comparison errors
-            mock_result.total_tokens = 0
-            mock_result.total_cost_estimate = 0.0
-            mock_result.embedding_requests = 0
-            mock_indexer.index_project.return_value = mock_result
+            mock_indexer.index_project.return_value = success_result
             # Fix: Mock _categorize_file_changes to return empty lists instead of Mock objects
             mock_indexer._categorize_file_changes.return_value = ([], [], [])
             # Fix: Mock other methods that might return iterables
@@ -479,56 +511,33 @@ class TestCLIIntegrationScenarios:
             mock_client.count.return_value = mock_count_result
             mock_indexer.vector_store.backend.client = mock_client
             mock_indexer.vector_store.client = mock_client
-            mock_indexer_class.return_value = mock_indexer
+            mocks['CoreIndexer'].return_value = mock_indexer
             
-            with patch('claude_indexer.cli_full.create_embedder_from_config'):
-                with patch('claude_indexer.cli_full.create_store_from_config'):
-                    # Mock file operations to prevent path errors
-                    mock_file = Mock()
-                    mock_file.__enter__ = Mock(return_value=mock_file)
-                    mock_file.__exit__ = Mock(return_value=None)
-                    with patch('builtins.open', Mock(return_value=mock_file)):
-                        with patch('json.dump', Mock()):
-                            result = runner.invoke(cli.cli, [
-                                'index',
-                                '--project', str(temp_repo),
-                                '--collection', 'test-config',
-                                '--config', str(config_file)
-                            ])
-                            
-                            if result.exit_code != 0:
-                                print(f"CLI failed with exit code {result.exit_code}")
-                                print(f"Output: {result.output}")
-                                print(f"Exception: {result.exception}")
-                            
-                            assert result.exit_code == 0
+            result = runner.invoke(cli.cli, [
+                'index',
+                '--project', str(temp_repo),
+                '--collection', 'test-config',
+                '--config', str(config_file)
+            ])
+            
+            assert result.exit_code == 0, f"{result.output}\n{result.exception}"
     
-    def test_cli_quiet_and_verbose_modes(self, temp_repo):
+    @pytest.mark.parametrize("flag", ["--verbose", "--quiet"])
+    def test_cli_output_mode(self, temp_repo, flag, runner, success_result, cli_mode_outputs):
         """Test CLI output modes."""
-        try:
-            import click
-            from click.testing import CliRunner
-        except ImportError:
-            pytest.skip("Click not available for CLI testing")
-        
-        runner = CliRunner()
-        
-        with patch('claude_indexer.cli_full.CoreIndexer') as mock_indexer_class:
+        # Mock file operations to prevent path errors
+        mock_file = Mock()
+        mock_file.__enter__ = Mock(return_value=mock_file)
+        mock_file.__exit__ = Mock(return_value=None)
+        
+        with patch.multiple(
+            'claude_indexer.cli_full',
+            CoreIndexer=DEFAULT,
+            create_embedder_from_config=DEFAULT,
+            create_store_from_config=DEFAULT
+        ) as mocks, patch('builtins.open', Mock(return_value=mock_file)), patch('json.dump', Mock()):
             mock_indexer = Mock()
-            mock_result = Mock()
-            mock_result.success = True
-            mock_result.processing_time = 1.5
-            mock_result.files_processed = 2
-            mock_result.entities_created = 5
-            mock_result.relations_created = 3
-            mock_result.implementation_chunks_created = 4  # Add missing attribute
-            mock_result.warnings = []
-            mock_result.errors = []
-            # Add missing cost tracking attributes to prevent Mock comparison errors
-            mock_result.total_tokens = 0
-            mock_result.total_cost_estimate = 0.0
-            mock_result.embedding_requests = 0
-            mock_indexer.index_project.return_value = mock_result
+            mock_indexer.index_project.return_value = success_result
             # Fix: Mock _categorize_file_changes to return empty lists instead of Mock objects
             mock_indexer._categorize_file_changes.return_value = ([], [], [])
             # Fix: Mock other methods that might return iterables
@@ -559,48 +568,27 @@ class TestCLIIntegrationScenarios:
             mock_client.count.return_value = mock_count_result
             mock_indexer.vector_store.backend.client = mock_client
             mock_indexer.vector_store.client = mock_client
-            mock_indexer_class.return_value = mock_indexer
+            mocks['CoreIndexer'].return_value = mock_indexer
+            
+            result = runner.invoke(cli.cli, [
+                'index',
+                '--project', str(temp_repo),
+                '--collection', f'test-{flag.lstrip("-")}',
+                flag
+            ])
             
-            with patch('claude_indexer.cli_full.create_embedder_from_config'):
-                with patch('claude_indexer.cli_full.create_store_from_config'):
-                    # Mock file operations to prevent path errors
-                    mock_file = Mock()
-                    mock_file.__enter__ = Mock(return_value=mock_file)
-                    mock_file.__exit__ = Mock(return_value=None)
-                    with patch('builtins.open', Mock(return_value=mock_file)):
-                        with patch('json.dump', Mock()):
-                            # Test verbose mode
-                            result_verbose = runner.invoke(cli.cli, [
-                                'index',
-                                '--project', str(temp_repo),
-                                '--collection', 'test-verbose',
-                                '--verbose'
-                            ])
-                            assert result_verbose.exit_code == 0
-                            
-                            # Test quiet mode
-                            result_quiet = runner.invoke(cli.cli, [
-                                'index',
-                                '--project', str(temp_repo),
-                                '--collection', 'test-quiet',
-                                '--quiet'
-                            ])
-                            
-                            assert result_quiet.exit_code == 0
-                            
-                            # Quiet mode should have less output than verbose
-                            assert len(result_quiet.output) <= len(result_verbose.output)
+            assert result.exit_code == 0, result.output
+            cli_mode_outputs[flag] = result.output
     
-    def test_cli_error_handling(self, temp_repo):
-        """Test CLI error handling and user-friendly error messages."""
-        try:
-            import click
-            from click.testing import CliRunner
-        except ImportError:
-            pytest.skip("Click not available for CLI testing")
-        
-        runner = CliRunner()
+    def test_quiet_shorter_than_verbose(self, cli_mode_outputs):
+        """Quiet mode should have less output than verbose."""
+        if not {"--quiet", "--verbose"} <= cli_mode_outputs.keys():
+            pytest.skip("Both output modes must run in this session first")
         
+        assert len(cli_mode_outputs["--quiet"]) <= len(cli_mode_outputs["--verbose"])
+    
+    def test_cli_error_handling(self, temp_repo, runner):
+        """Test CLI error handling and user-friendly error messages."""
         # Test configuration errors
         with patch('claude_indexer.cli_full.load_config') as mock_load_config:
             mock_load_config.side_effect = ValueError("Invalid configuration")
@@ -612,78 +600,79 @@ class TestCLIIntegrationScenarios:
             ])
             
             assert result.exit_code != 0
-            assert "Error" in result.output
+            assert b"Error" in result.output_bytes
         
         # Test indexing errors
-        with patch('claude_indexer.cli_full.CoreIndexer') as mock_indexer_class:
+        with patch.multiple(
+            'claude_indexer.cli_full',
+            CoreIndexer=DEFAULT,
+            create_embedder_from_config=DEFAULT,
+            create_store_from_config=DEFAULT
+        ) as mocks:
             mock_indexer = Mock()
             mock_indexer.index_project.side_effect = Exception("Indexing failed")
-            mock_indexer_class.return_value = mock_indexer
+            mocks['CoreIndexer'].return_value = mock_indexer
             
-            with patch('claude_indexer.cli_full.create_embedder_from_config'):
-                with patch('claude_indexer.cli_full.create_store_from_config'):
-                    result = runner.invoke(cli.cli, [
-                        'index',
-                        '--project', str(temp_repo),
-                        '--collection', 'test-index-error'
-                    ])
-                    
-                    assert result.exit_code != 0
-                    assert "Error" in result.output
+            result = runner.invoke(cli.cli, [
+                'index',
+                '--project', str(temp_repo),
+                '--collection', 'test-index-error'
+            ])
+            
+            assert result.exit_code != 0
+            assert b"Error" in result.output_bytes
 
 
 @pytest.mark.e2e
 class TestPerformanceAndScalability:
     """Test performance characteristics under various conditions."""
     
-    def test_indexing_performance_baseline(self, temp_repo, dummy_embedder, qdrant_store, test_config):
+    # pytest-benchmark disables itself under xdist and would record nothing
+    @pytest.mark.skipif("PYTEST_XDIST_WORKER" in os.environ,
+                        reason="benchmarks need a serial run: pytest -n 0")
+    def test_indexing_performance_baseline(self, benchmark, temp_repo, fast_embedder, qdrant_store, indexer_config, worker_collection):
         """Test basic performance characteristics."""
-        config = test_config
+        config = indexer_config
+        collection = worker_collection("test_performance")
         
-        from claude_indexer.indexer import CoreIndexer
         indexer = CoreIndexer(
             config=config,
-            embedder=dummy_embedder,
+            embedder=fast_embedder,
             vector_store=qdrant_store,
             project_path=temp_repo
         )
         
-        start_time = time.time()
-        result = indexer.index_project("test_performance")
-        duration = time.time() - start_time
+        # One round only: repeat calls would hit the incremental no-change path
+        result = benchmark.pedantic(indexer.index_project, args=(collection,), rounds=1, iterations=1)
         
         assert result.success
-        assert duration < 30.0  # Should complete reasonably quickly
-        
-        # Performance should scale reasonably with content
-        entities_per_second = result.entities_created / duration if duration > 0 else float('inf')
-        assert entities_per_second > 0.1  # Minimum reasonable throughput
+        assert result.entities_created > 0
     
-    def test_incremental_indexing_performance(self, temp_repo, dummy_embedder, qdrant_store, test_config):
+    def test_incremental_indexing_performance(self, temp_repo, fast_embedder, qdrant_store, indexer_config, worker_collection):
         """Test that incremental indexing is faster than full re-indexing."""
-        config = test_config
+        config = indexer_config
+        collection = worker_collection("test_incremental_perf")
         
-        from claude_indexer.indexer import CoreIndexer
         indexer = CoreIndexer(
             config=config,
-            embedder=dummy_embedder,
+            embedder=fast_embedder,
             vector_store=qdrant_store,
             project_path=temp_repo
         )
         
         # Initial full index
-        start_time = time.time()
-        result1 = indexer.index_project("test_incremental_perf")
-        full_index_time = time.time() - start_time
+        start_time = time.perf_counter()
+        result1 = indexer.index_project(collection)
+        full_index_time = time.perf_counter() - start_time
         
         # Add one small file
         small_file = temp_repo / "small_addition.py"
         small_file.write_text('def small_func(): return "small"')
         
         # Incremental index
-        start_time = time.time()
-        result2 = indexer.index_project("test_incremental_perf")
-        incremental_time = time.time() - start_time
+        start_time = time.perf_counter()
+        result2 = indexer.index_project(collection)
+        incremental_time = time.perf_counter() - start_time
         
         assert result1.success
         assert result2.success
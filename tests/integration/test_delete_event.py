@@ -3,37 +3,71 @@ Integration tests for file deletion and cleanup scenarios.
 
 Tests how the indexer handles file deletions and ensures
 proper cleanup of vectors and entities.
+
+Each xdist worker gets its own collection, so the file can be spread
+across workers with ``pytest -n auto tests/integration/test_delete_event.py``.
 """
 
 import pytest
 from pathlib import Path
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+
+from claude_indexer.embeddings.base import EmbeddingResult
+from tests.conftest import DummyEmbedder, file_has_points, truncate_collection, write_tree, xdist_worker_id
+
+
+@pytest.fixture(scope="module")
+def collection_name(qdrant_store):
+    """One collection per xdist worker for the whole module, dropped after the last test.
+    
+    Created once up front (emptied if a previous run left it behind), so tests
+    only ever truncate it and never pay for collection setup again.
+    """
+    name = f"test_delete_shared_{xdist_worker_id()}"
+    if qdrant_store.collection_exists(name):
+        truncate_collection(qdrant_store, name)
+    else:
+        qdrant_store.create_collection(name, vector_size=1536)
+    yield name
+    qdrant_store.delete_collection(name)
+
 
-from claude_indexer.indexer import CoreIndexer
-from claude_indexer.config import IndexerConfig
+@pytest.fixture(autouse=True)
+def _truncate_collection(qdrant_store, collection_name):
+    """Empty the shared collection after each test instead of recreating it."""
+    yield
+    truncate_collection(qdrant_store, collection_name)
+
+
+@pytest.fixture
+def indexer(make_indexer, collection_name):
+    """Indexer over this test's repo copy, writing to the shared collection.
+    
+    Kept per test: CoreIndexer is bound to one project path and its state file,
+    and construction itself is cheap.
+    """
+    return make_indexer(collection_name)
+
+
+class ErrorTriggerEmbedder(DummyEmbedder):
+    """DummyEmbedder whose results fail for any text mentioning error_trigger."""
+    
+    def embed_batch(self, texts: list[str]):
+        # Fail per item, like a real embedder, so one bad text doesn't sink the batch
+        results = iter(super().embed_batch([t for t in texts if "error_trigger" not in t]))
+        return [
+            EmbeddingResult(text=t, embedding=[], error="Injected embedding failure")
+            if "error_trigger" in t else next(results)
+            for t in texts
+        ]
 
 
 @pytest.mark.integration
 class TestDeleteEventHandling:
     """Test file deletion and vector cleanup."""
     
-    def test_simple_file_deletion_cleanup(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_simple_file_deletion_cleanup(self, indexer, temp_repo, qdrant_store, collection_name):
         """Test cleanup when a single file is deleted."""
-        import time
-        collection_name = f"test_delete_simple_{int(time.time() * 1000)}"
-        
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
-        
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
         
         # Initial indexing
         result1 = indexer.index_project(collection_name, include_tests=True)
@@ -42,15 +76,8 @@ class TestDeleteEventHandling:
         initial_count = qdrant_store.count(collection_name)
         assert initial_count >= 3  # foo.py, bar.py, helpers.py
         
-        # Verify we can find content from foo.py
-        search_embedding = dummy_embedder.embed_single("add function")
-        hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
-        
-        foo_entities_before = [
-            hit for hit in hits 
-            if "foo.py" in hit.payload.get("file_path", "")
-        ]
-        assert len(foo_entities_before) > 0, "Should find entities from foo.py initially"
+        # Verify foo.py is indexed
+        assert file_has_points(qdrant_store, collection_name, temp_repo / "foo.py"), "Should find entities from foo.py initially"
         
         # Delete foo.py
         (temp_repo / "foo.py").unlink()
@@ -63,72 +90,22 @@ class TestDeleteEventHandling:
         final_count = qdrant_store.count(collection_name)
         assert final_count < initial_count, "Vector count should decrease after file deletion"
         
-        # Wait for eventual consistency and verify entities from deleted file are gone
-        from tests.conftest import wait_for_eventual_consistency
-        
-        def search_foo_entities():
-            # Try multiple search terms that should match foo.py entities
-            search_terms = ["Calculator", "add", "multiply", "foo.py"]
-            all_foo_hits = []
-            
-            for term in search_terms:
-                search_embedding = dummy_embedder.embed_single(term)
-                hits = qdrant_store.search(collection_name, search_embedding, top_k=20)
-                foo_hits = [
-                    hit for hit in hits 
-                    if (hit.payload.get("file_path", "").endswith("foo.py") and
-                        not hit.payload.get("file_path", "").endswith("test_foo.py"))
-                ]
-                all_foo_hits.extend(foo_hits)
-            
-            # Remove duplicates by ID
-            unique_foo_hits = []
-            seen_ids = set()
-            for hit in all_foo_hits:
-                hit_id = getattr(hit, 'id', None)
-                if hit_id not in seen_ids:
-                    unique_foo_hits.append(hit)
-                    seen_ids.add(hit_id)
-            
-            return unique_foo_hits
-        
-        consistency_achieved = wait_for_eventual_consistency(
-            search_foo_entities, 
-            expected_count=0, 
-            timeout=15.0,
-            verbose=True
-        )
-        assert consistency_achieved, "Eventual consistency timeout: foo.py entities should be deleted"
+        # Verify no point from the deleted file is left
+        assert not file_has_points(qdrant_store, collection_name, temp_repo / "foo.py"), "foo.py entities should be deleted"
     
-    def test_multiple_file_deletion(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_multiple_file_deletion(self, indexer, temp_repo, qdrant_store, collection_name):
         """Test cleanup when multiple files are deleted."""
-        import time
-        collection_name = f"test_delete_multi_{int(time.time() * 1000)}"
-        
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
-        
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
         
         # Add extra files to delete
-        extra_files = []
-        for i in range(3):
-            extra_file = temp_repo / f"extra_{i}.py"
-            extra_file.write_text(f'''"""Extra module {i}."""
+        extra_files = write_tree(temp_repo, {
+            f"extra_{i}.py": f'''"""Extra module {i}."""
 
 def extra_function_{i}():
     """Extra function {i}."""
     return {i}
-''')
-            extra_files.append(extra_file)
+'''
+            for i in range(3)
+        })
         
         # Initial indexing
         result1 = indexer.index_project(collection_name, include_tests=True)
@@ -136,14 +113,8 @@ def extra_function_{i}():
         
         initial_count = qdrant_store.count(collection_name)
         
-        # Verify extra files are indexed with eventual consistency
-        from tests.conftest import verify_entity_searchable
-        for i in range(3):
-            entity_found = verify_entity_searchable(
-                qdrant_store, dummy_embedder, collection_name,
-                f"extra_function_{i}", timeout=10.0, verbose=True
-            )
-            assert entity_found, f"extra_function_{i} should be found initially after indexing"
+        # Verify extra files are indexed
+        assert all(file_has_points(qdrant_store, collection_name, f) for f in extra_files), "extra_0..2 should be found initially after indexing"
         
         # Delete all extra files
         for extra_file in extra_files:
@@ -156,51 +127,16 @@ def extra_function_{i}():
         final_count = qdrant_store.count(collection_name)
         assert final_count < initial_count, "Count should decrease after multiple deletions"
         
-        # Wait for eventual consistency and verify all extra functions are gone
-        from tests.conftest import wait_for_eventual_consistency
-        
-        for i in range(3):
-            def search_extra_function():
-                search_embedding = dummy_embedder.embed_single(f"extra_function_{i}")
-                hits = qdrant_store.search(collection_name, search_embedding, top_k=5)
-                return [
-                    hit for hit in hits
-                    if f"extra_function_{i}" in hit.payload.get("name", "")
-                ]
-            
-            consistency_achieved = wait_for_eventual_consistency(
-                search_extra_function,
-                expected_count=0,
-                timeout=10.0,
-                verbose=True
-            )
-            assert consistency_achieved, f"Eventual consistency timeout: extra_function_{i} should be deleted"
+        # Verify every extra file is gone
+        assert not any(file_has_points(qdrant_store, collection_name, f) for f in extra_files), "extra_0..2 entities should be deleted"
     
-    def test_directory_deletion_cleanup(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_directory_deletion_cleanup(self, indexer, temp_repo, qdrant_store, collection_name):
         """Test cleanup when an entire directory is deleted."""
-        import time
-        collection_name = f"test_delete_dir_{int(time.time() * 1000)}"
-        
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
-        
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
         
         # Create a subdirectory with files
         subdir = temp_repo / "to_delete"
-        subdir.mkdir()
-        
-        for i in range(2):
-            sub_file = subdir / f"sub_module_{i}.py"
-            sub_file.write_text(f'''"""Sub module {i}."""
+        sub_files = write_tree(temp_repo, {
+            f"to_delete/sub_module_{i}.py": f'''"""Sub module {i}."""
 
 class SubClass_{i}:
     """Sub class {i}."""
@@ -208,7 +144,9 @@ class SubClass_{i}:
     def sub_method_{i}(self):
         """Sub method {i}."""
         return "sub_{i}"
-''')
+'''
+            for i in range(2)
+        })
         
         # Initial indexing
         result1 = indexer.index_project(collection_name)
@@ -217,18 +155,11 @@ class SubClass_{i}:
         initial_count = qdrant_store.count(collection_name)
         
         # Verify subdirectory content is indexed
-        search_embedding = dummy_embedder.embed_single("SubClass_0")
-        hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
-        
-        subdir_entities_before = [
-            hit for hit in hits 
-            if "to_delete" in hit.payload.get("file_path", "")
-        ]
-        assert len(subdir_entities_before) > 0, "Should find entities from subdirectory"
+        assert all(file_has_points(qdrant_store, collection_name, f) for f in sub_files), "Should find entities from subdirectory"
         
         # Delete entire subdirectory
         import shutil
-        shutil.rmtree(subdir)
+        shutil.rmtree(subdir, ignore_errors=True)
         
         # Re-index with cleanup
         result2 = indexer.index_project(collection_name)
@@ -238,44 +169,18 @@ class SubClass_{i}:
         assert final_count < initial_count, "Count should decrease after directory deletion"
         
         # Verify subdirectory entities are gone
-        search_embedding = dummy_embedder.embed_single("SubClass_0")
-        hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
-        
-        subdir_entities_after = [
-            hit for hit in hits 
-            if "to_delete" in hit.payload.get("file_path", "")
-        ]
-        assert len(subdir_entities_after) == 0, "Should not find entities from deleted subdirectory"
+        assert not any(file_has_points(qdrant_store, collection_name, f) for f in sub_files), "Should not find entities from deleted subdirectory"
     
-    def test_partial_deletion_with_remaining_files(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_partial_deletion_with_remaining_files(self, indexer, temp_repo, qdrant_store, collection_name):
         """Test that deletion cleanup doesn't affect remaining files."""
-        import time
-        collection_name = f"test_delete_partial_{int(time.time() * 1000)}"
-        
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
-        
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
         
         # Initial indexing
         result1 = indexer.index_project(collection_name)
         assert result1.success
         
-        # Verify existing files are indexed with eventual consistency
-        from tests.conftest import verify_entity_searchable
-        calc_found = verify_entity_searchable(
-            qdrant_store, dummy_embedder, collection_name,
-            "Calculator", timeout=10.0, verbose=True, expected_count=1
-        )
-        assert calc_found, "Calculator class should be found before deletion"
+        # Verify both files are indexed
+        assert file_has_points(qdrant_store, collection_name, temp_repo / "foo.py"), "foo.py should be indexed before deletion"
+        assert file_has_points(qdrant_store, collection_name, temp_repo / "bar.py"), "bar.py should be indexed before deletion"
         
         # Delete bar.py but keep foo.py
         (temp_repo / "bar.py").unlink()
@@ -284,54 +189,12 @@ class SubClass_{i}:
         result2 = indexer.index_project(collection_name)
         assert result2.success
         
-        # Verify that foo.py entities are still present - search for add function instead of Calculator
-        search_embedding = dummy_embedder.embed_single("add")
-        hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
-        
-        # Look for entities that are from foo.py (should remain after bar.py deletion)
-        foo_entities_after = [
-            hit for hit in hits 
-            if hit.payload.get("file_path", "").endswith("foo.py") and 
-               hit.payload.get("entity_name") in ["add", "Calculator"]
-        ]
-        assert len(foo_entities_after) > 0, "foo.py entities should still be found after bar.py deletion"
-        
-        # Wait for eventual consistency and verify bar.py entities are gone
-        from tests.conftest import wait_for_eventual_consistency
-        
-        def search_bar_entities():
-            search_embedding = dummy_embedder.embed_single("main")
-            hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
-            return [
-                hit for hit in hits 
-                if "bar.py" in hit.payload.get("file_path", "")
-            ]
-        
-        consistency_achieved = wait_for_eventual_consistency(
-            search_bar_entities,
-            expected_count=0,
-            timeout=10.0,
-            verbose=True
-        )
-        assert consistency_achieved, "Eventual consistency timeout: bar.py entities should be deleted"
+        # Verify that foo.py entities are still present and bar.py entities are gone
+        assert file_has_points(qdrant_store, collection_name, temp_repo / "foo.py"), "foo.py entities should still be found after bar.py deletion"
+        assert not file_has_points(qdrant_store, collection_name, temp_repo / "bar.py"), "bar.py entities should be deleted"
     
-    def test_deletion_state_persistence(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_deletion_state_persistence(self, indexer, temp_repo, dummy_embedder, qdrant_store, collection_name):
         """Test that deletion state is properly persisted between indexing runs."""
-        import time
-        collection_name = f"test_delete_persistence_{int(time.time() * 1000)}"
-        
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
-        
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
         
         # Create a temporary file
         temp_file = temp_repo / "temporary.py"
@@ -346,64 +209,39 @@ def temp_func():
         result1 = indexer.index_project(collection_name)
         assert result1.success
         
-        # Verify temp file is indexed with eventual consistency
-        from tests.conftest import verify_entity_searchable
-        temp_found = verify_entity_searchable(
-            qdrant_store, dummy_embedder, collection_name,
-            "temp_func", timeout=10.0, verbose=True
-        )
-        assert temp_found, "Temp function should be found initially"
+        # Verify temp file is indexed
+        assert file_has_points(qdrant_store, collection_name, temp_file), "Temp function should be found initially"
         
         # Delete the file
         temp_file.unlink()
         
-        # First index (should clean up)
-        result2 = indexer.index_project(collection_name)
+        # First index (should clean up) - a deletion-only run never embeds
+        with patch.object(dummy_embedder, "embed_batch", wraps=dummy_embedder.embed_batch) as embed_batch:
+            result2 = indexer.index_project(collection_name)
         assert result2.success
+        assert result2.files_processed == 0
+        embed_batch.assert_not_called()
         
-        # Second index (should remember deletion)
-        result3 = indexer.index_project(collection_name)
+        # Second index (should remember deletion) - the state already dropped
+        # the file, so nothing is left to look up or delete
+        with patch.object(qdrant_store, "delete_by_files", wraps=qdrant_store.delete_by_files) as delete_by_files:
+            result3 = indexer.index_project(collection_name)
         assert result3.success
+        assert result3.files_processed == 0
+        delete_by_files.assert_not_called()
         
         # Verify temp function is still gone after multiple runs
-        search_embedding = dummy_embedder.embed_single("temp_func")
-        hits = qdrant_store.search(collection_name, search_embedding, top_k=5)
-        
-        temp_found_after = any(
-            "temp_func" in hit.payload.get("name", "")
-            for hit in hits
-        )
-        assert not temp_found_after, "Temp function should remain deleted after multiple indexing runs"
+        assert not file_has_points(qdrant_store, collection_name, temp_file), "Temp function should remain deleted after multiple indexing runs"
     
-    def test_deletion_with_indexing_errors(self, temp_repo, dummy_embedder, qdrant_store, tmp_path):
+    def test_deletion_with_indexing_errors(self, make_indexer, temp_repo, qdrant_store, collection_name, tmp_path):
         """Test that deletion cleanup works even when there are indexing errors."""
-        import time
-        collection_name = f"test_delete_errors_{int(time.time() * 1000)}"
         
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant",
+        indexer = make_indexer(
+            collection_name,
+            embedder=ErrorTriggerEmbedder(),
             state_dir=str(tmp_path / "state")  # Use temporary state directory
         )
         
-        # Create a mock embedder that fails for some content
-        failing_embedder = Mock()
-        
-        def selective_embedding(text):
-            if "error_trigger" in text:
-                raise Exception("Mock embedding failure")
-            return dummy_embedder.embed_single(text)
-        
-        failing_embedder.embed_single.side_effect = selective_embedding
-        
-        indexer = CoreIndexer(
-            config=config,
-            embedder=failing_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
-        
         # Create a file that will cause embedding errors
         error_file = temp_repo / "error_file.py"
         error_file.write_text('''"""File with error trigger."""
@@ -418,6 +256,7 @@ def error_trigger_function():
         # May succeed or fail depending on error handling, but should not crash
         
         initial_count = qdrant_store.count(collection_name)
+        assert initial_count > 0, "Healthy files should still be stored alongside the failing one"
         
         # Delete the error file
         error_file.unlink()
@@ -436,23 +275,8 @@ def error_trigger_function():
 class TestDeleteEventEdgeCases:
     """Test edge cases in deletion handling."""
     
-    def test_delete_nonexistent_file_references(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_delete_nonexistent_file_references(self, indexer, temp_repo, qdrant_store, collection_name):
         """Test handling deletion of files that were never indexed."""
-        import time
-        collection_name = f"test_delete_nonexistent_{int(time.time() * 1000)}"
-        
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
-        
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
         
         # Initial indexing
         result1 = indexer.index_project(collection_name)
@@ -463,29 +287,19 @@ class TestDeleteEventEdgeCases:
         temp_file.write_text("def never_indexed(): pass")
         temp_file.unlink()
         
-        # Indexing should handle missing file gracefully
-        result2 = indexer.index_project(collection_name)
+        # Nothing changed against the saved state, so the run is a no-op that
+        # never reaches Qdrant
+        with patch.object(qdrant_store, "client", Mock(wraps=qdrant_store.client)) as client:
+            result2 = indexer.index_project(collection_name)
         assert result2.success
+        assert result2.files_processed == 0
+        assert client.method_calls == []
     
-    def test_delete_during_indexing_race_condition(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_delete_during_indexing_race_condition(self, indexer, temp_repo, collection_name):
         """Test race condition where file is deleted during indexing."""
-        import time
-        collection_name = f"test_delete_race_{int(time.time() * 1000)}"
-        
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
         
         # This is a simplified test - in practice, this would require
         # more complex threading/timing setup
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
         
         # Create a file
         race_file = temp_repo / "race_condition.py"
@@ -502,23 +316,8 @@ class TestDeleteEventEdgeCases:
         result2 = indexer.index_project(collection_name)
         assert result2.success  # Should not crash
     
-    def test_orphan_relation_cleanup_integration(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_orphan_relation_cleanup_integration(self, indexer, temp_repo, qdrant_store, collection_name):
         """Test that orphaned relations are cleaned up when entities are deleted."""
-        import time
-        collection_name = f"test_orphan_cleanup_{int(time.time() * 1000)}"
-        
-        config = IndexerConfig(
-            collection_name=collection_name,
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
-        
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
         
         # Create files with relationships
         main_file = temp_repo / "main_module.py"
@@ -573,65 +372,60 @@ def helper_function():
         final_relations = qdrant_store._get_all_relations(collection_name)
         final_entities = qdrant_store._get_all_entity_names(collection_name)
         
-        # Check that all remaining relations reference existing entities
-        orphaned_relations = []
-        for relation in final_relations:
-            from_entity = relation.payload.get('entity_name', '')
-            to_entity = relation.payload.get('relation_target', '')
+        # Use same module resolution logic as the cleanup function
+        def resolve_module_name(module_name: str, entity_names: set) -> bool:
+            """Check if module name resolves to any existing entity."""
+            if module_name in entity_names:
+                return True
             
-            # Debug: Print entity names and relations for investigation
-            if len(orphaned_relations) == 0:  # Only print once
-                print(f"DEBUG: Sample entity names: {list(final_entities)[:10]}")
-                print(f"DEBUG: Checking relation: {from_entity} -> {to_entity}")
-                print(f"DEBUG: from_entity in final_entities: {from_entity in final_entities}")
-                print(f"DEBUG: to_entity in final_entities: {to_entity in final_entities}")
-            
-            # Use same module resolution logic as the cleanup function
-            def resolve_module_name(module_name: str, entity_names: set) -> bool:
-                """Check if module name resolves to any existing entity."""
-                if module_name in entity_names:
-                    return True
-                
-                # Handle relative imports (.chat.parser, ..config, etc.)
-                if module_name.startswith('.'):
-                    clean_name = module_name.lstrip('.')
-                    for entity_name in entity_names:
-                        # Direct pattern match first
-                        if entity_name.endswith(f"/{clean_name}.py") or entity_name.endswith(f"\\{clean_name}.py"):
-                            return True
-                        # Handle dot notation (chat.parser -> chat/parser.py)
-                        if '.' in clean_name:
-                            path_version = clean_name.replace('.', '/')
-                            if entity_name.endswith(f"/{path_version}.py") or entity_name.endswith(f"\\{path_version}.py"):
-                                return True
-                        # Fallback: contains check
-                        if clean_name in entity_name and entity_name.endswith('.py'):
-                            return True
-                
-                # Handle absolute module paths (claude_indexer.analysis.entities)
-                elif '.' in module_name:
-                    path_parts = module_name.split('.')
-                    for entity_name in entity_names:
-                        # Check if entity path contains module structure and ends with .py
-                        if (all(part in entity_name for part in path_parts) and 
-                            entity_name.endswith('.py') and path_parts[-1] in entity_name):
-                            return True
-                
-                # Handle package-level imports (claude_indexer -> any /path/claude_indexer/* files)
-                else:
-                    # Single package name without dots
-                    for entity_name in entity_names:
-                        # Check if entity path contains the package name as a directory
-                        if f"/{module_name}/" in entity_name or f"\\{module_name}\\" in entity_name:
-                            return True
-                        # Also check if entity path ends with the package name as a directory
-                        if entity_name.endswith(f"/{module_name}") or entity_name.endswith(f"\\{module_name}"):
-                            return True
-                        # Check if entity name contains module name and ends with .py
-                        if module_name in entity_name and entity_name.endswith('.py'):
+            # Handle relative imports (.chat.parser, ..config, etc.)
+            if module_name.startswith('.'):
+                clean_name = module_name.lstrip('.')
+                for entity_name in entity_names:
+                    # Direct pattern match first
+                    if entity_name.endswith(f"/{clean_name}.py") or entity_name.endswith(f"\\{clean_name}.py"):
+                        return True
+                    # Handle dot notation (chat.parser -> chat/parser.py)
+                    if '.' in clean_name:
+                        path_version = clean_name.replace('.', '/')
+                        if entity_name.endswith(f"/{path_version}.py") or entity_name.endswith(f"\\{path_version}.py"):
                             return True
-                
-                return False
+                    # Fallback: contains check
+                    if clean_name in entity_name and entity_name.endswith('.py'):
+                        return True
+            
+            # Handle absolute module paths (claude_indexer.analysis.entities)
+            elif '.' in module_name:
+                path_parts = module_name.split('.')
+                for entity_name in entity_names:
+                    # Check if entity path contains module structure and ends with .py
+                    if (all(part in entity_name for part in path_parts) and 
+                        entity_name.endswith('.py') and path_parts[-1] in entity_name):
+                        return True
+            
+            # Handle package-level imports (claude_indexer -> any /path/claude_indexer/* files)
+            else:
+                # Single package name without dots
+                for entity_name in entity_names:
+                    # Check if entity path contains the package name as a directory
+                    if f"/{module_name}/" in entity_name or f"\\{module_name}\\" in entity_name:
+                        return True
+                    # Also check if entity path ends with the package name as a directory
+                    if entity_name.endswith(f"/{module_name}") or entity_name.endswith(f"\\{module_name}"):
+                        return True
+                    # Check if entity name contains module name and ends with .py
+                    if module_name in entity_name and entity_name.endswith('.py'):
+                        return True
+            
+            return False
+        
+        # Check that all remaining relations reference existing entities (a set, so O(1) lookups)
+        print(f"DEBUG: Sample entity names: {sorted(final_entities)[:10]}")
+        orphaned_relations = []
+        for relation in final_relations:
+            payload = relation.payload
+            from_entity = payload.get('entity_name', '')
+            to_entity = payload.get('relation_target', '')
             
             # Use module resolution for better accuracy like the cleanup function does
             from_missing = from_entity not in final_entities and not resolve_module_name(from_entity, final_entities)
@@ -648,54 +442,9 @@ def helper_function():
             f"Expected relation count to decrease from {initial_relation_count} to {len(final_relations)}"
         )
         
-        # Wait for eventual consistency and verify entities from deleted file are gone
-        from tests.conftest import wait_for_eventual_consistency
-        
-        def search_helpers_entities():
-            search_embedding = dummy_embedder.embed_single("helper_function")
-            hits = qdrant_store.search(collection_name, search_embedding, top_k=20)
-            return [
-                hit for hit in hits 
-                if hit.payload.get("file_path", "").endswith("helpers.py") and "utils/" not in hit.payload.get("file_path", "")
-            ]
-        
-        consistency_achieved = wait_for_eventual_consistency(
-            search_helpers_entities,
-            expected_count=0,
-            timeout=10.0,
-            verbose=True
-        )
-        assert consistency_achieved, "Eventual consistency timeout: helpers.py entities should be deleted"
+        # index_project waits on its deletes, so the points are gone once it returns
+        assert not file_has_points(qdrant_store, collection_name, helpers_file), "helpers.py entities should be deleted"
         
         # Verify remaining entities from main_module.py and utils.py still exist
-        main_search = dummy_embedder.embed_single("MainClass")
-        main_hits = qdrant_store.search(collection_name, main_search, top_k=10)
-        
-        # Debug: Print search results for main_module.py verification
-        print(f"DEBUG: MainClass search returned {len(main_hits)} hits:")
-        for i, hit in enumerate(main_hits):
-            file_path = hit.payload.get("file_path", "N/A")
-            entity_name = hit.payload.get("entity_name", "N/A")
-            name = hit.payload.get("name", "N/A")
-            print(f"  Hit {i}: entity_name='{entity_name}', name='{name}', file_path='{file_path}'")
-        
-        main_entities = [
-            hit for hit in main_hits 
-            if "main_module.py" in hit.payload.get("file_path", "")
-        ]
-        
-        # If the search approach fails, try checking if main_module.py entities exist in final_entities
-        if len(main_entities) == 0:
-            main_module_entities_in_collection = [
-                entity for entity in final_entities 
-                if "main_module.py" in str(entity) or "MainClass" in str(entity)
-            ]
-            print(f"DEBUG: Found {len(main_module_entities_in_collection)} main_module.py related entities in final_entities")
-            print(f"DEBUG: main_module.py entities: {main_module_entities_in_collection}")
-            
-            # If entities exist in the collection, the test should pass
-            if len(main_module_entities_in_collection) > 0:
-                print("DEBUG: main_module.py entities found via direct collection check - test should pass")
-                return  # Skip the assertion since we verified entities exist via collection check
-        
-        assert len(main_entities) > 0, f"Should still find entities from main_module.py. Search hits: {len(main_hits)}, main_entities: {len(main_entities)}"
\ No newline at end of file
+        assert file_has_points(qdrant_store, collection_name, main_file), "Should still find entities from main_module.py"
+        assert file_has_points(qdrant_store, collection_name, utils_file), "Should still find entities from utils.py"
\ No newline at end of file
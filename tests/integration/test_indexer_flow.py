@@ -165,8 +165,10 @@ def extract_processed_files_from_cli_output(output: str) -> list:
 class TestACustomFlow:
     """Test complete indexing workflows."""
     
-    def test_full_index_flow_with_real_files(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_full_index_flow_with_real_files(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test complete indexing flow with real Python files."""
+        collection_name = worker_collection("test_integration")
+        
         # Load real API keys from settings.txt instead of using hardcoded test keys
         base_config = load_config()
         config = IndexerConfig(
@@ -183,7 +185,7 @@ class TestACustomFlow:
         )
         
         # Index the temporary repository
-        result = indexer.index_project("test_integration")
+        result = indexer.index_project(collection_name)
         
         # Verify indexing succeeded
         assert result.success is True
@@ -191,12 +193,12 @@ class TestACustomFlow:
         assert result.relations_created >= 1  # At least one import relation
         
         # Verify vectors were stored
-        count = qdrant_store.count("test_integration")
+        count = qdrant_store.count(collection_name)
         assert count >= 3, f"Expected at least 3 vectors, got {count}"
         
         # Verify we can search for content
         search_embedding = dummy_embedder.embed_single("add function")
-        hits = qdrant_store.search("test_integration", search_embedding, top_k=10)
+        hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
         
         assert len(hits) > 0
         # Should find the add function from foo.py
@@ -208,8 +210,10 @@ class TestACustomFlow:
         )
         assert add_function_found
     
-    def test_incremental_indexing_flow(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_incremental_indexing_flow(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test incremental indexing with file changes."""
+        collection_name = worker_collection("test_incremental")
+        
         # Load real API keys from settings.txt instead of using hardcoded test keys
         base_config = load_config()
         config = IndexerConfig(
@@ -226,8 +230,8 @@ class TestACustomFlow:
         )
         
         # Initial index
-        result1 = indexer.index_project("test_incremental")
-        initial_count = qdrant_store.count("test_incremental")
+        result1 = indexer.index_project(collection_name)
+        initial_count = qdrant_store.count(collection_name)
         
         # Modify a file
         modified_file = temp_repo / "foo.py"
@@ -236,29 +240,18 @@ class TestACustomFlow:
         modified_file.write_text(modified_content)
         
         # Second index (should auto-detect incremental mode)
-        result2 = indexer.index_project("test_incremental")
-        final_count = qdrant_store.count("test_incremental")
+        result2 = indexer.index_project(collection_name)
+        final_count = qdrant_store.count(collection_name)
         
         # Verify incremental indexing worked
         assert result2.success is True
         assert final_count >= initial_count  # Should have same or more vectors
         
-        # Verify we can find the new function with eventual consistency
-        from tests.conftest import wait_for_eventual_consistency
-        
-        def search_for_subtract():
-            search_embedding = dummy_embedder.embed_single("subtract function")
-            hits = qdrant_store.search("test_incremental", search_embedding, top_k=10)
-            return [hit for hit in hits if 
-                    "subtract" in hit.payload.get("entity_name", "").lower() or
-                    "subtract" in hit.payload.get("name", "").lower() or
-                    "subtract" in hit.payload.get("content", "").lower()]
-        
         # Debug: Check what entities exist in the collection
         all_entities = []
         try:
             scroll_result = qdrant_store.client.scroll(
-                collection_name="test_incremental",
+                collection_name=collection_name,
                 limit=100,
                 with_payload=True
             )
@@ -272,12 +265,9 @@ class TestACustomFlow:
             file_path = entity.payload.get("file_path", "N/A")
             print(f"  - {name} (from {file_path})")
         
-        # Wait for eventual consistency
-        wait_for_eventual_consistency(search_for_subtract, expected_count=1, verbose=True)
-        
-        # Final verification
+        # Upserts wait until applied, so the new function is searchable right away
         search_embedding = dummy_embedder.embed_single("subtract function")
-        hits = qdrant_store.search("test_incremental", search_embedding, top_k=10)
+        hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
         
         print(f"Search results for 'subtract function': {len(hits)} hits")
         for hit in hits:
@@ -308,63 +298,66 @@ class TestACustomFlow:
         
         assert subtract_found, f"subtract function not found in {len(hits)} search results"
     
-    def test_error_handling_in_flow(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_error_handling_in_flow(self, make_indexer, temp_repo, fast_embedder, worker_collection):
         """Test error handling during indexing flow."""
-        config = IndexerConfig(
-            collection_name="test_errors",
-            embedder_type="dummy", 
-            storage_type="qdrant"
-        )
+        collection_name = worker_collection("test_errors")
         
         # Create a file with syntax errors
         bad_file = temp_repo / "bad_syntax.py"
         bad_file.write_text("def broken(\n    return 'invalid syntax'")
         
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
+        indexer = make_indexer(collection_name, embedder=fast_embedder)
         
         # Indexing should still succeed for valid files
-        result = indexer.index_project("test_errors")
+        result = indexer.index_project(collection_name)
         
         # Should be successful overall despite individual file errors
         assert result.success is True
         assert result.entities_created >= 2  # Valid files still processed
         assert len(result.errors) >= 1  # Should track parsing errors
     
-    def test_empty_project_indexing(self, empty_repo, dummy_embedder, qdrant_store):
+    def test_failed_deletion_cleanup_is_retried(self, make_indexer, temp_repo, qdrant_store, worker_collection):
+        """Test deleted files stay in state for a retry when removing their entities fails."""
+        from claude_indexer.storage.base import StorageResult
+        from tests.conftest import file_has_points
+        
+        collection_name = worker_collection("test_deletion_retry")
+        indexer = make_indexer(collection_name)
+        assert indexer.index_project(collection_name).success
+        
+        deleted_file = temp_repo / "bar.py"
+        deleted_file.unlink()
+        
+        failed_delete = StorageResult(success=False, operation="delete", errors=["Simulated delete outage"])
+        with patch.object(qdrant_store, "delete_by_files", return_value=failed_delete):
+            result = indexer.index_project(collection_name)
+        
+        assert any("will retry" in warning for warning in result.warnings)
+        assert "bar.py" in indexer._load_state(collection_name), "bar.py should stay in state until its entities are gone"
+        assert file_has_points(qdrant_store, collection_name, deleted_file)
+        
+        # The next incremental run sees bar.py as deleted again and finishes the cleanup
+        indexer.index_project(collection_name)
+        assert not file_has_points(qdrant_store, collection_name, deleted_file), "bar.py entities should be deleted on retry"
+        assert "bar.py" not in indexer._load_state(collection_name)
+    
+    def test_empty_project_indexing(self, make_indexer, empty_repo, fast_embedder, qdrant_store, worker_collection):
         """Test indexing an empty project."""
-        config = IndexerConfig(
-            collection_name="test_empty",
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
+        collection_name = worker_collection("test_empty")
         
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=empty_repo
-        )
+        indexer = make_indexer(collection_name, project_path=empty_repo, embedder=fast_embedder)
         
-        result = indexer.index_project("test_empty")
+        result = indexer.index_project(collection_name)
         
         # Should succeed with no entities
         assert result.success is True
         assert result.entities_created == 0
         assert result.relations_created == 0
-        assert qdrant_store.count("test_empty") == 0
+        assert qdrant_store.count(collection_name) == 0
     
-    def test_large_file_batching(self, tmp_path, dummy_embedder, qdrant_store):
+    def test_large_file_batching(self, make_indexer, tmp_path, fast_embedder, qdrant_store, worker_collection):
         """Test indexing with many files to verify batching."""
-        config = IndexerConfig(
-            collection_name="test_batching",
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
+        collection_name = worker_collection("test_batching")
         
         # Create many small Python files
         for i in range(20):
@@ -378,27 +371,18 @@ def function_{i}():
 CLASS_{i} = "constant_{i}"
 ''')
         
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=tmp_path
-        )
+        indexer = make_indexer(collection_name, project_path=tmp_path, embedder=fast_embedder)
         
-        result = indexer.index_project("test_batching")
+        result = indexer.index_project(collection_name)
         
         # Should successfully process all files
         assert result.success is True
         assert result.entities_created >= 40  # At least 2 entities per file
-        assert qdrant_store.count("test_batching") >= 40
+        assert qdrant_store.count(collection_name) >= 40
     
-    def test_duplicate_entity_handling(self, tmp_path, dummy_embedder, qdrant_store):
+    def test_duplicate_entity_handling(self, make_indexer, tmp_path, dummy_embedder, qdrant_store, worker_collection):
         """Test handling of duplicate entities across files."""
-        config = IndexerConfig(
-            collection_name="test_duplicates",
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
+        collection_name = worker_collection("test_duplicates")
         
         # Create files with same function names
         file1 = tmp_path / "module1.py"
@@ -415,21 +399,16 @@ def common_function():
     return 2
 ''')
         
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=tmp_path
-        )
+        indexer = make_indexer(collection_name, project_path=tmp_path)
         
-        result = indexer.index_project("test_duplicates")
+        result = indexer.index_project(collection_name)
         
         # Should handle duplicates gracefully
         assert result.success is True
         
         # Search should find both implementations
         search_embedding = dummy_embedder.embed_single("common_function")
-        hits = qdrant_store.search("test_duplicates", search_embedding, top_k=10)
+        hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
         
         # Should find function in both files
         file_paths = {hit.payload.get("file_path", "") for hit in hits}
@@ -441,15 +420,11 @@ def common_function():
 class TestIndexerConfiguration:
     """Test indexer configuration and initialization."""
     
-    def test_indexer_with_different_embedders(self, temp_repo, qdrant_store):
+    def test_indexer_with_different_embedders(self, make_indexer, worker_collection):
         """Test indexer with different embedder configurations."""
-        # Test with dummy embedder
-        config = IndexerConfig(
-            collection_name="test_embedders",
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
+        collection_name = worker_collection("test_embedders")
         
+        # Test with dummy embedder
         with patch('claude_indexer.embeddings.registry.create_embedder_from_config') as mock_create:
             from claude_indexer.embeddings.base import EmbeddingResult
             
@@ -482,49 +457,33 @@ class TestIndexerConfiguration:
             
             mock_create.return_value = mock_embedder
             
-            indexer = CoreIndexer(
-                config=config,
-                embedder=mock_embedder,
-                vector_store=qdrant_store,
-                project_path=temp_repo
-            )
+            indexer = make_indexer(collection_name, embedder=mock_embedder)
             
-            result = indexer.index_project("test_embedders")
+            result = indexer.index_project(collection_name)
             assert result.success is True
             
             # Verify embedder was used
             assert mock_embedder.embed_text.called or mock_embedder.embed_batch.called
     
-    def test_indexer_with_custom_filters(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_indexer_with_custom_filters(self, make_indexer, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test indexer with custom file filters."""
-        config = IndexerConfig(
-            collection_name="test_filters",
-            embedder_type="dummy",
-            storage_type="qdrant",
-            include_patterns=["*.py"],
-            exclude_patterns=["test_*"]
-        )
+        collection_name = worker_collection("test_filters")
         
         # Add test files that should be excluded
         test_dir = temp_repo / "tests"
         test_dir.mkdir(exist_ok=True)
         (test_dir / "test_example.py").write_text("def test_something(): pass")
         
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
+        indexer = make_indexer(collection_name, include_patterns=["*.py"], exclude_patterns=["test_*"])
         
-        result = indexer.index_project("test_filters")
+        result = indexer.index_project(collection_name)
         
         # Should exclude test files
         assert result.success is True
         
         # Verify test files were not indexed
         search_embedding = dummy_embedder.embed_single("test_something")
-        hits = qdrant_store.search("test_filters", search_embedding, top_k=10)
+        hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
         
         test_files_found = any(
             "test_" in hit.payload.get("file_path", "")
@@ -537,22 +496,13 @@ class TestIndexerConfiguration:
 class TestIndexerPerformance:
     """Test indexer performance characteristics."""
     
-    def test_indexing_performance_tracking(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_indexing_performance_tracking(self, make_indexer, fast_embedder, worker_collection):
         """Test that indexing tracks performance metrics."""
-        config = IndexerConfig(
-            collection_name="test_performance",
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
+        collection_name = worker_collection("test_performance")
         
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=temp_repo
-        )
+        indexer = make_indexer(collection_name, embedder=fast_embedder)
         
-        result = indexer.index_project("test_performance")
+        result = indexer.index_project(collection_name)
         
         # Should track timing information
         assert result.success is True
@@ -563,13 +513,9 @@ class TestIndexerPerformance:
         assert result.files_processed >= 3
         assert result.entities_created >= 3
     
-    def test_memory_efficient_processing(self, tmp_path, dummy_embedder, qdrant_store):
+    def test_memory_efficient_processing(self, make_indexer, tmp_path, fast_embedder, qdrant_store, worker_collection):
         """Test that large projects don't consume excessive memory."""
-        config = IndexerConfig(
-            collection_name="test_memory",
-            embedder_type="dummy",
-            storage_type="qdrant"
-        )
+        collection_name = worker_collection("test_memory")
         
         # Create larger files to test memory usage
         for i in range(5):
@@ -586,30 +532,27 @@ def function_{i}_{j}(param_{j}):
 '''
             large_file.write_text(content)
         
-        indexer = CoreIndexer(
-            config=config,
-            embedder=dummy_embedder,
-            vector_store=qdrant_store,
-            project_path=tmp_path
-        )
+        indexer = make_indexer(collection_name, project_path=tmp_path, embedder=fast_embedder)
         
         # Should process without memory issues
-        result = indexer.index_project("test_memory")
+        result = indexer.index_project(collection_name)
         
         assert result.success is True
         assert result.entities_created >= 250  # 5 files * 50 functions each
-        assert qdrant_store.count("test_memory") >= 250
+        assert qdrant_store.count(collection_name) >= 250
 
 
 @pytest.mark.integration
 class TestACustomIncrementalBehavior:
     """Custom tests for precise incremental indexing behavior verification."""
     
-    def test_custom_single_new_file_processing(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_custom_single_new_file_processing(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test that exactly 1 new file is processed in incremental mode using CLI."""
         import subprocess
         import tempfile
         
+        collection_name = worker_collection("test_custom_new_file")
+        
         # Create settings file for CLI with real API keys
         base_config = load_config()
         settings_file = temp_repo / "settings.txt"
@@ -623,7 +566,7 @@ qdrant_url={base_config.qdrant_url}
         result1 = subprocess.run([
             "python", "-m", "claude_indexer", "index",
             "--project", str(temp_repo),
-            "--collection", "test_custom_new_file",
+            "--collection", collection_name,
             "--verbose"
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
@@ -631,7 +574,7 @@ qdrant_url={base_config.qdrant_url}
         initial_errors = result1.stderr
         
         assert result1.returncode == 0, f"Initial indexing failed: {initial_errors}"
-        initial_count = qdrant_store.count("test_custom_new_file")
+        initial_count = qdrant_store.count(collection_name)
         
         # CONSOLE LOG CHECKS - Initial indexing should show CLI output
         assert "Mode: Full" in initial_output or "files to process" in initial_output.lower(), \
@@ -641,7 +584,7 @@ qdrant_url={base_config.qdrant_url}
         
         # Find state file location (CLI uses project-local state directory)
         state_dir = temp_repo / '.claude-indexer'
-        state_file = state_dir / "test_custom_new_file.json"
+        state_file = state_dir / f"{collection_name}.json"
         
         # Verify state file was created after initial index
         assert state_file.exists(), f"State file should exist at {state_file}"
@@ -665,7 +608,7 @@ NEW_CONSTANT = "test_value"
         result2 = subprocess.run([
             "python", "-m", "claude_indexer", "index",
             "--project", str(temp_repo),
-            "--collection", "test_custom_new_file",
+            "--collection", collection_name,
             "--verbose"
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
@@ -673,7 +616,7 @@ NEW_CONSTANT = "test_value"
         incremental_errors = result2.stderr
         
         assert result2.returncode == 0, f"Incremental indexing failed: {incremental_errors}"
-        final_count = qdrant_store.count("test_custom_new_file")
+        final_count = qdrant_store.count(collection_name)
         
         # CONSOLE LOG CHECKS - Incremental indexing should show CLI mode output
         assert "Mode: Incremental" in incremental_output or "1 files to process" in incremental_output, \
@@ -716,16 +659,18 @@ NEW_CONSTANT = "test_value"
         search_result = subprocess.run([
             "python", "-m", "claude_indexer", "search", "new_function",
             "--project", str(temp_repo),
-            "--collection", "test_custom_new_file"
+            "--collection", collection_name
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
         assert search_result.returncode == 0, f"Search failed: {search_result.stderr}"
         assert "new_function" in search_result.stdout, "Should find new_function in search results"
     
-    def test_custom_single_file_deletion(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_custom_single_file_deletion(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test that exactly 1 deleted file is processed in incremental mode using CLI."""
         import subprocess
         
+        collection_name = worker_collection("test_custom_deletion")
+        
         # Create settings file for CLI with real API keys
         base_config = load_config()
         settings_file = temp_repo / "settings.txt"
@@ -749,7 +694,7 @@ DELETABLE_CONSTANT = "to_be_removed"
         result1 = subprocess.run([
             "python", "-m", "claude_indexer", "index",
             "--project", str(temp_repo),
-            "--collection", "test_custom_deletion",
+            "--collection", collection_name,
             "--verbose"
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
@@ -757,7 +702,7 @@ DELETABLE_CONSTANT = "to_be_removed"
         initial_errors = result1.stderr
         
         assert result1.returncode == 0, f"Initial indexing failed: {initial_errors}"
-        initial_count = qdrant_store.count("test_custom_deletion")
+        initial_count = qdrant_store.count(collection_name)
         
         # CONSOLE LOG CHECKS - Initial indexing should show CLI output
         assert "Mode: Full" in initial_output or "files to process" in initial_output.lower(), \
@@ -767,7 +712,7 @@ DELETABLE_CONSTANT = "to_be_removed"
         
         # Find state file location (CLI uses project-local state directory)
         state_dir = temp_repo / '.claude-indexer'
-        state_file = state_dir / "test_custom_deletion.json"
+        state_file = state_dir / f"{collection_name}.json"
         
         # Verify state file was created and contains deletable file
         assert state_file.exists(), f"State file should exist at {state_file}"
@@ -784,7 +729,7 @@ DELETABLE_CONSTANT = "to_be_removed"
         result2 = subprocess.run([
             "python", "-m", "claude_indexer", "index",
             "--project", str(temp_repo),
-            "--collection", "test_custom_deletion",
+            "--collection", collection_name,
             "--verbose"
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
@@ -792,7 +737,7 @@ DELETABLE_CONSTANT = "to_be_removed"
         deletion_errors = result2.stderr
         
         assert result2.returncode == 0, f"Deletion indexing failed: {deletion_errors}"
-        final_count = qdrant_store.count("test_custom_deletion")
+        final_count = qdrant_store.count(collection_name)
         
         # CONSOLE LOG CHECKS - Deletion processing should show CLI mode output
         assert "Mode: Incremental" in deletion_output, \
@@ -830,7 +775,7 @@ DELETABLE_CONSTANT = "to_be_removed"
         search_result = subprocess.run([
             "python", "-m", "claude_indexer", "search", "deletable_function",
             "--project", str(temp_repo),
-            "--collection", "test_custom_deletion"
+            "--collection", collection_name
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
         assert search_result.returncode == 0, f"Search failed: {search_result.stderr}"
@@ -850,10 +795,12 @@ DELETABLE_CONSTANT = "to_be_removed"
         assert expected_remaining.issubset(remaining_files), \
             f"Expected remaining files {expected_remaining}, got {remaining_files}"
     
-    def test_custom_three_new_files_processing(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_custom_three_new_files_processing(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test that exactly 3 new files are processed in incremental mode using CLI."""
         import subprocess
         
+        collection_name = worker_collection("test_custom_three_new")
+        
         # Create settings file for CLI with real API keys
         base_config = load_config()
         settings_file = temp_repo / "settings.txt"
@@ -867,7 +814,7 @@ qdrant_url={base_config.qdrant_url}
         result1 = subprocess.run([
             "python", "-m", "claude_indexer", "index",
             "--project", str(temp_repo),
-            "--collection", "test_custom_three_new",
+            "--collection", collection_name,
             "--verbose"
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
@@ -875,7 +822,7 @@ qdrant_url={base_config.qdrant_url}
         initial_errors = result1.stderr
         
         assert result1.returncode == 0, f"Initial indexing failed: {initial_errors}"
-        initial_count = qdrant_store.count("test_custom_three_new")
+        initial_count = qdrant_store.count(collection_name)
         
         # CONSOLE LOG CHECKS - Initial indexing should show CLI output
         assert "Mode: Full" in initial_output or "files to process" in initial_output.lower(), \
@@ -885,7 +832,7 @@ qdrant_url={base_config.qdrant_url}
         
         # Find state file location (CLI uses project-local state directory)
         state_dir = temp_repo / '.claude-indexer'
-        state_file = state_dir / "test_custom_three_new.json"
+        state_file = state_dir / f"{collection_name}.json"
         
         # Verify state file was created after initial index
         assert state_file.exists(), f"State file should exist at {state_file}"
@@ -917,7 +864,7 @@ class NewClass_{i}:
         result2 = subprocess.run([
             "python", "-m", "claude_indexer", "index",
             "--project", str(temp_repo),
-            "--collection", "test_custom_three_new",
+            "--collection", collection_name,
             "--verbose"
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
@@ -925,7 +872,7 @@ class NewClass_{i}:
         incremental_errors = result2.stderr
         
         assert result2.returncode == 0, f"Incremental indexing failed: {incremental_errors}"
-        final_count = qdrant_store.count("test_custom_three_new")
+        final_count = qdrant_store.count(collection_name)
         
         # CONSOLE LOG CHECKS - Incremental indexing should show CLI mode output
         assert "Mode: Incremental" in incremental_output, \
@@ -973,16 +920,18 @@ class NewClass_{i}:
             search_result = subprocess.run([
                 "python", "-m", "claude_indexer", "search", f"new_function_{i}",
                 "--project", str(temp_repo),
-                "--collection", "test_custom_three_new"
+                "--collection", collection_name
             ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
             
             assert search_result.returncode == 0, f"Search failed for new_function_{i}: {search_result.stderr}"
             assert f"new_function_{i}" in search_result.stdout, f"Should find new_function_{i} in search results"
     
-    def test_custom_three_files_deletion(self, temp_repo, dummy_embedder, qdrant_store):
+    def test_custom_three_files_deletion(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test that exactly 3 deleted files are processed in incremental mode using CLI."""
         import subprocess
         
+        collection_name = worker_collection("test_custom_three_deletion")
+        
         # Create settings file for CLI with real API keys
         base_config = load_config()
         settings_file = temp_repo / "settings.txt"
@@ -1014,7 +963,7 @@ class DeletableClass_{i}:
         result1 = subprocess.run([
             "python", "-m", "claude_indexer", "index",
             "--project", str(temp_repo),
-            "--collection", "test_custom_three_deletion",
+            "--collection", collection_name,
             "--verbose"
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
@@ -1022,7 +971,7 @@ class DeletableClass_{i}:
         initial_errors = result1.stderr
         
         assert result1.returncode == 0, f"Initial indexing failed: {initial_errors}"
-        initial_count = qdrant_store.count("test_custom_three_deletion")
+        initial_count = qdrant_store.count(collection_name)
         
         # CONSOLE LOG CHECKS - Initial indexing should show CLI output
         assert "Mode: Full" in initial_output or "files to process" in initial_output.lower(), \
@@ -1032,7 +981,7 @@ class DeletableClass_{i}:
         
         # Find state file location (CLI uses project-local state directory)
         state_dir = temp_repo / '.claude-indexer'
-        state_file = state_dir / "test_custom_three_deletion.json"
+        state_file = state_dir / f"{collection_name}.json"
         
         # Verify state file was created and contains all deletable files
         assert state_file.exists(), f"State file should exist at {state_file}"
@@ -1053,7 +1002,7 @@ class DeletableClass_{i}:
         result2 = subprocess.run([
             "python", "-m", "claude_indexer", "index",
             "--project", str(temp_repo),
-            "--collection", "test_custom_three_deletion",
+            "--collection", collection_name,
             "--verbose"
         ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
         
@@ -1061,7 +1010,7 @@ class DeletableClass_{i}:
         deletion_errors = result2.stderr
         
         assert result2.returncode == 0, f"Deletion indexing failed: {deletion_errors}"
-        final_count = qdrant_store.count("test_custom_three_deletion")
+        final_count = qdrant_store.count(collection_name)
         
         # CONSOLE LOG CHECKS - Deletion processing should show CLI mode output
         assert "Mode: Incremental" in deletion_output, \
@@ -1108,7 +1057,7 @@ class DeletableClass_{i}:
             search_result = subprocess.run([
                 "python", "-m", "claude_indexer", "search", f"deletable_function_{i}",
                 "--project", str(temp_repo),
-                "--collection", "test_custom_three_deletion"
+                "--collection", collection_name
             ], capture_output=True, text=True, cwd=temp_repo, timeout=120)
             
             assert search_result.returncode == 0, f"Search failed for deletable_function_{i}: {search_result.stderr}"
@@ -26,12 +26,11 @@ from claude_indexer.config import IndexerConfig
 class TestWatcherFlow:
     """Test file watching integration."""
     
-    async def test_basic_file_watch_flow(self, temp_repo, dummy_embedder, qdrant_store):
+    async def test_basic_file_watch_flow(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test basic file watching and re-indexing."""
-        import time
         from tests.conftest import wait_for_collection_ready, verify_entity_searchable
         
-        collection_name = f"test_watcher_{int(time.time() * 1000)}"
+        collection_name = worker_collection("test_watcher")
         config = IndexerConfig(
             collection_name=collection_name,
             embedder_type="dummy",
@@ -93,12 +92,11 @@ class TestWatcherFlow:
             except asyncio.CancelledError:
                 pass
     
-    async def test_multiple_file_changes(self, temp_repo, dummy_embedder, qdrant_store):
+    async def test_multiple_file_changes(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test watching multiple file changes."""
-        import time
         from tests.conftest import wait_for_collection_ready, verify_entity_searchable
         
-        collection_name = f"test_multi_watch_{int(time.time() * 1000)}"
+        collection_name = worker_collection("test_multi_watch")
         config = IndexerConfig(
             collection_name=collection_name,
             embedder_type="dummy",
@@ -155,10 +153,12 @@ class TestWatcherFlow:
             except asyncio.CancelledError:
                 pass
     
-    async def test_new_file_creation(self, temp_repo, dummy_embedder, qdrant_store):
+    async def test_new_file_creation(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test watching for new file creation."""
+        collection_name = worker_collection("test_new_files")
+        
         config = IndexerConfig(
-            collection_name="test_new_files",
+            collection_name=collection_name,
             embedder_type="dummy",
             storage_type="qdrant",
             watch_debounce=0.1
@@ -195,7 +195,7 @@ class NewClass:
             
             # Verify new file was indexed
             search_embedding = dummy_embedder.embed_single("fresh_function")
-            hits = qdrant_store.search("test_new_files", search_embedding, top_k=5)
+            hits = qdrant_store.search(collection_name, search_embedding, top_k=5)
             
             fresh_function_found = any(
                 "fresh_function" in hit.payload.get("name", "")
@@ -205,7 +205,7 @@ class NewClass:
             
             # Also check for the new class
             search_embedding = dummy_embedder.embed_single("NewClass")
-            hits = qdrant_store.search("test_new_files", search_embedding, top_k=5)
+            hits = qdrant_store.search(collection_name, search_embedding, top_k=5)
             
             new_class_found = any(
                 "NewClass" in hit.payload.get("name", "")
@@ -221,10 +221,12 @@ class NewClass:
             except asyncio.CancelledError:
                 pass
     
-    async def test_file_deletion_handling(self, temp_repo, dummy_embedder, qdrant_store):
+    async def test_file_deletion_handling(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test watching for file deletion."""
+        collection_name = worker_collection("test_deletions")
+        
         config = IndexerConfig(
-            collection_name="test_deletions",
+            collection_name=collection_name,
             embedder_type="dummy",
             storage_type="qdrant",
             watch_debounce=0.1
@@ -254,7 +256,7 @@ def temp_function():
             
             # Verify the function exists
             search_embedding = dummy_embedder.embed_single("temp_function")
-            hits = qdrant_store.search("test_deletions", search_embedding, top_k=5)
+            hits = qdrant_store.search(collection_name, search_embedding, top_k=5)
             
             temp_function_found = any(
                 "temp_function" in hit.payload.get("name", "")
@@ -269,17 +271,11 @@ def temp_function():
             await asyncio.sleep(0.5)
             
             # Wait for eventual consistency and verify the function is properly cleaned up
-            from tests.conftest import wait_for_eventual_consistency
+            from tests.conftest import file_has_points, wait_for_eventual_consistency
             
             def search_temp_function():
-                search_embedding = dummy_embedder.embed_single("temp_function")
-                hits = qdrant_store.search("test_deletions", search_embedding, top_k=5)
-                # Return hits that reference the deleted file
-                return [
-                    hit for hit in hits 
-                    if "temp_function" in hit.payload.get("name", "") 
-                    and "temporary.py" in hit.payload.get("file_path", "")
-                ]
+                # Filter on the file server-side instead of sifting top-k hits
+                return file_has_points(qdrant_store, collection_name, temp_file)
             
             consistency_achieved = wait_for_eventual_consistency(
                 search_temp_function,
@@ -297,10 +293,38 @@ def temp_function():
             except asyncio.CancelledError:
                 pass
     
-    async def test_watcher_error_handling(self, temp_repo, dummy_embedder, qdrant_store):
+    async def test_batch_deletions_cleanup(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
+        """Test a debounced batch of deleted files drops their points and state entries."""
+        from claude_indexer.indexer import CoreIndexer
+        from claude_indexer.watcher.handler import AsyncWatcherHandler
+        from tests.conftest import file_has_points
+        
+        collection_name = worker_collection("test_watcher_deletions")
+        config = IndexerConfig(
+            collection_name=collection_name,
+            embedder_type="dummy",
+            storage_type="qdrant"
+        )
+        indexer = CoreIndexer(config, dummy_embedder, qdrant_store, temp_repo)
+        assert indexer.index_project(collection_name).success
+        
+        deleted_file = temp_repo / "bar.py"
+        assert file_has_points(qdrant_store, collection_name, deleted_file), "bar.py should be indexed before deletion"
+        deleted_file.unlink()
+        
+        handler = AsyncWatcherHandler(temp_repo, config, dummy_embedder, qdrant_store)
+        await handler._process_batch({"modified_files": [], "deleted_files": [str(deleted_file)]})
+        
+        assert not file_has_points(qdrant_store, collection_name, deleted_file), "bar.py entities should be deleted"
+        assert "bar.py" not in indexer._load_state(collection_name), "bar.py should be dropped from the state file"
+        assert file_has_points(qdrant_store, collection_name, temp_repo / "foo.py"), "foo.py entities should remain"
+    
+    async def test_watcher_error_handling(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test watcher handles errors gracefully."""
+        collection_name = worker_collection("test_error_handling")
+        
         config = IndexerConfig(
-            collection_name="test_error_handling",
+            collection_name=collection_name,
             embedder_type="dummy",
             storage_type="qdrant",
             watch_debounce=0.1
@@ -341,10 +365,12 @@ def temp_function():
             except asyncio.CancelledError:
                 pass
     
-    async def test_debouncing_behavior(self, temp_repo, dummy_embedder, qdrant_store):
+    async def test_debouncing_behavior(self, temp_repo, dummy_embedder, qdrant_store, monkeypatch, worker_collection):
         """Test that rapid file changes are properly debounced."""
+        collection_name = worker_collection("test_debounce")
+        
         config = IndexerConfig(
-            collection_name="test_debounce",
+            collection_name=collection_name,
             embedder_type="dummy",
             storage_type="qdrant",
             watch_debounce=0.3  # Longer debounce for testing
@@ -358,7 +384,8 @@ def temp_function():
             index_calls.append(time.time())
             return original_index(*args, **kwargs)
         
-        qdrant_store.upsert_points = tracking_upsert
+        # The store is session-scoped, so undo the patch when the test ends
+        monkeypatch.setattr(qdrant_store, "upsert_points", tracking_upsert)
         
         watcher = Watcher(
             repo_path=temp_repo,
@@ -400,10 +427,12 @@ class TestWatcherConfiguration:
     """Test watcher configuration options."""
     
     @pytest.mark.skipif(not WATCHER_AVAILABLE, reason="Watcher components not available")
-    async def test_custom_file_patterns(self, temp_repo, dummy_embedder, qdrant_store):
+    async def test_custom_file_patterns(self, temp_repo, dummy_embedder, qdrant_store, worker_collection):
         """Test watcher with custom include/exclude patterns."""
+        collection_name = worker_collection("test_patterns")
+        
         config = IndexerConfig(
-            collection_name="test_patterns",
+            collection_name=collection_name,
             embedder_type="dummy",
             storage_type="qdrant",
             include_patterns=["*.py"],
@@ -435,7 +464,7 @@ class TestWatcherConfiguration:
             
             # Check that only valid file was indexed
             search_embedding = dummy_embedder.embed_single("valid_func")
-            hits = qdrant_store.search("test_patterns", search_embedding, top_k=10)
+            hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
             
             valid_found = any(
                 "valid_func" in hit.payload.get("name", "")
@@ -446,7 +475,7 @@ class TestWatcherConfiguration:
             # Check that ignored files were not indexed
             for ignored_func in ["test_func", "temp_func"]:
                 search_embedding = dummy_embedder.embed_single(ignored_func)
-                hits = qdrant_store.search("test_patterns", search_embedding, top_k=10)
+                hits = qdrant_store.search(collection_name, search_embedding, top_k=10)
                 
                 ignored_found = any(
                     ignored_func in hit.payload.get("name", "")
@@ -474,4 +474,18 @@ class TestDummyEmbedder:
         
         embedding = custom_embedder.embed_single("test")
         assert len(embedding) == 512
-        assert embedding.dtype == np.float32
\ No newline at end of file
+        assert embedding.dtype == np.float32
+    
+    def test_fast_embedder_shares_vector(self, fast_embedder):
+        """Test that the constant embedder reuses one read-only vector."""
+        embedding1 = fast_embedder.embed_single("first text")
+        embedding2 = fast_embedder.embed_single("second text")
+        
+        assert embedding1 is embedding2
+        assert len(embedding1) == 1536
+        assert embedding1.dtype == np.float32
+        assert not embedding1.flags.writeable
+        
+        results = fast_embedder.embed_batch(["a", "b"])
+        assert all(r.success for r in results)
+        assert results[0].embedding is results[1].embedding
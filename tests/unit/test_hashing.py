@@ -219,6 +219,25 @@ class TestIndexingState:
         
         assert loaded_state == {}
     
+    def test_load_state_reuses_parse_until_file_replaced(self, tmp_path):
+        """Test repeated loads parse once and pick up a rewritten state file."""
+        from unittest.mock import patch
+        from claude_indexer.config import IndexerConfig
+        config = IndexerConfig()
+        config.state_directory = tmp_path
+        indexer = CoreIndexer(config, None, None, tmp_path)
+        
+        indexer._atomic_json_write(indexer.state_file, {"a.py": {"hash": "1"}})
+        with patch("claude_indexer.indexer.json.load", wraps=json.load) as load:
+            first = indexer._load_state("default")
+            first["b.py"] = {"hash": "2"}
+            assert indexer._load_state("default") == {"a.py": {"hash": "1"}}
+            assert load.call_count == 1
+        
+            indexer._atomic_json_write(indexer.state_file, {"c.py": {"hash": "3"}})
+            assert indexer._load_state("default") == {"c.py": {"hash": "3"}}
+            assert load.call_count == 2
+    
     def test_get_current_state(self, tmp_path):
         """Test getting current state for files."""
         from claude_indexer.config import IndexerConfig
@@ -369,4 +388,123 @@ class TestIncrementalIndexing:
         
         # All files should be found in full mode
         assert len(all_files) == 3
-        assert set(all_files) == set(files)
\ No newline at end of file
+        assert set(all_files) == set(files)
+    
+    def test_categorize_file_changes(self, tmp_path):
+        """Test new, modified and deleted files are split apart, ignoring metadata keys."""
+        from claude_indexer.config import IndexerConfig
+        config = IndexerConfig()
+        config.state_directory = tmp_path / "state"
+        config.state_directory.mkdir()
+        project = tmp_path / "project"
+        project.mkdir()
+        indexer = CoreIndexer(config, None, None, project)
+        
+        kept = project / "kept.py"
+        modified = project / "modified.py"
+        removed = project / "removed.py"
+        for file_path in (kept, modified, removed):
+            file_path.write_text(f"# {file_path.name}")
+        indexer._update_state([kept, modified, removed], "test", full_rebuild=True)
+        
+        modified.write_text("# changed content")
+        removed.unlink()
+        added = project / "added.py"
+        added.write_text("# new file")
+        
+        new_files, modified_files, deleted_files = indexer._categorize_file_changes(False, "test")
+        assert new_files == [added]
+        assert modified_files == [modified]
+        assert deleted_files == ["removed.py"]
+        
+        changed_files, deleted = indexer._find_changed_files(False, "test")
+        assert set(changed_files) == {added, modified}
+        assert deleted == ["removed.py"]
+    
+    def test_unchanged_stat_skips_hashing(self, tmp_path):
+        """Test files whose size and mtime match the saved state are not re-read."""
+        import os
+        import time
+        from unittest.mock import patch
+        from claude_indexer.config import IndexerConfig
+        config = IndexerConfig()
+        config.state_directory = tmp_path / "state"
+        config.state_directory.mkdir()
+        project = tmp_path / "project"
+        project.mkdir()
+        indexer = CoreIndexer(config, None, None, project)
+        
+        kept = project / "kept.py"
+        edited = project / "edited.py"
+        for file_path in (kept, edited):
+            file_path.write_text(f"# {file_path.name}")
+            # Well before the state save, so the racy-clean guard trusts the stat
+            past = time.time() - 100
+            os.utime(file_path, (past, past))
+        indexer._update_state([kept, edited], "test", full_rebuild=True)
+        
+        edited.write_text("# edited, with a different size")
+        
+        with patch.object(indexer, "_get_file_hash", wraps=indexer._get_file_hash) as get_hash:
+            changed_files, deleted = indexer._find_changed_files(False, "test")
+        
+        assert changed_files == [edited]
+        assert deleted == []
+        assert [call.args[0] for call in get_hash.call_args_list] == [edited]
+    
+    def test_same_size_edit_is_detected(self, tmp_path):
+        """Test an edit that keeps the file size is still picked up via its mtime."""
+        import os
+        import time
+        from claude_indexer.config import IndexerConfig
+        config = IndexerConfig()
+        config.state_directory = tmp_path / "state"
+        config.state_directory.mkdir()
+        project = tmp_path / "project"
+        project.mkdir()
+        indexer = CoreIndexer(config, None, None, project)
+        
+        edited = project / "edited.py"
+        edited.write_text("# version 1")
+        past = time.time() - 100
+        os.utime(edited, (past, past))
+        indexer._update_state([edited], "test", full_rebuild=True)
+        
+        edited.write_text("# version 2")
+        
+        changed_files, deleted = indexer._find_changed_files(False, "test")
+        assert changed_files == [edited]
+        assert deleted == []
+    
+    def test_edit_during_state_hashing_is_detected(self, tmp_path):
+        """Test a same-size write landing while the state is hashed is not masked."""
+        import os
+        import time
+        from unittest.mock import patch
+        from claude_indexer.config import IndexerConfig
+        config = IndexerConfig()
+        config.state_directory = tmp_path / "state"
+        config.state_directory.mkdir()
+        project = tmp_path / "project"
+        project.mkdir()
+        indexer = CoreIndexer(config, None, None, project)
+        
+        edited = project / "edited.py"
+        edited.write_text("# version 1")
+        past = time.time() - 100
+        os.utime(edited, (past, past))
+        
+        original_hash = indexer._get_file_hash
+        
+        def hash_then_edit(file_path):
+            file_hash = original_hash(file_path)
+            file_path.write_text("# version 2")
+            os.utime(file_path, (past + 1, past + 1))
+            return file_hash
+        
+        with patch.object(indexer, "_get_file_hash", side_effect=hash_then_edit):
+            indexer._update_state([edited], "test", full_rebuild=True)
+        
+        changed_files, deleted = indexer._find_changed_files(False, "test")
+        assert changed_files == [edited]
+        assert deleted == []
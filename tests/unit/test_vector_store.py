@@ -34,6 +34,28 @@ class TestQdrantStore:
                     timeout=60.0
                 )
     
+    def test_initialization_prefer_grpc(self):
+        """Test QdrantStore forwards the gRPC preference to the client."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                store = QdrantStore(url="http://localhost:6333", prefer_grpc=True)
+                
+                assert store.prefer_grpc is True
+                mock_client_class.assert_called_once_with(
+                    url="http://localhost:6333",
+                    timeout=60.0,
+                    prefer_grpc=True,
+                    grpc_port=6334
+                )
+    
+    def test_initialization_in_memory(self):
+        """Test the :memory: URL opens an in-process client without server options."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                QdrantStore(url=":memory:", api_key="unused", prefer_grpc=True)
+                
+                mock_client_class.assert_called_once_with(location=":memory:")
+    
     def test_initialization_connection_error(self):
         """Test initialization with connection error."""
         with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
@@ -77,6 +99,70 @@ class TestQdrantStore:
                 assert result.items_processed == 1
                 mock_client.create_collection.assert_called_once()
     
+    def test_create_collection_indexing_threshold(self):
+        """Test collection creation uses the store's HNSW indexing threshold."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore(indexing_threshold=20000)
+                store.create_collection("test_collection", 1536)
+                
+                call_args = mock_client.create_collection.call_args
+                assert call_args.kwargs["optimizers_config"] == {"indexing_threshold": 20000}
+    
+    def test_create_collection_payload_indexes(self):
+        """Test collection creation adds keyword indexes for the filtered payload keys."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                result = store.create_collection("test_collection", 1536)
+                
+                assert result.success
+                indexed = [c.kwargs["field_name"] for c in mock_client.create_payload_index.call_args_list]
+                assert indexed == ["file_path", "entity_name", "content_hash", "chunk_type"]
+    
+    def test_create_collection_payload_index_failure(self):
+        """Test a failed payload index does not fail the already-created collection."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client.create_payload_index.side_effect = Exception("Timeout")
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                result = store.create_collection("test_collection", 1536)
+                
+                assert result.success
+                assert result.errors == []
+                mock_client.create_collection.assert_called_once()
+    
+    def test_ensure_collection_adds_missing_payload_indexes(self):
+        """Test an existing collection gets only the keyword indexes it lacks, checked once."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                existing = MagicMock()
+                existing.name = "test_collection"
+                mock_client.get_collections.return_value.collections = [existing]
+                mock_client.get_collection.return_value.payload_schema = {
+                    "file_path": MagicMock(), "entity_name": MagicMock()
+                }
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                assert store.ensure_collection("test_collection", 1536)
+                assert store.ensure_collection("test_collection", 1536)
+                
+                mock_client.create_collection.assert_not_called()
+                mock_client.get_collection.assert_called_once_with("test_collection")
+                indexed = [c.kwargs["field_name"] for c in mock_client.create_payload_index.call_args_list]
+                assert indexed == ["content_hash", "chunk_type"]
+    
     def test_create_collection_invalid_distance_metric(self):
         """Test collection creation with invalid distance metric."""
         with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
@@ -189,6 +275,25 @@ class TestQdrantStore:
                 assert result.items_processed == 2
                 mock_client.upsert.assert_called_once()
     
+    def test_batch_upsert_waits_on_every_batch(self):
+        """Test that batch_upsert splits points and blocks until each batch is applied."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                store.ensure_collection = MagicMock(return_value=True)
+                
+                points = [VectorPoint(id=i, vector=[0.1] * 4, payload={}) for i in range(1200)]
+                result = store.batch_upsert("test_collection", points)
+                
+                assert result.success
+                assert result.items_processed == 1200
+                calls = mock_client.upsert.call_args_list
+                assert [len(c.kwargs["points"]) for c in calls] == [512, 512, 176]
+                assert [c.kwargs["wait"] for c in calls] == [True, True, True]
+    
     def test_upsert_points_empty_list(self):
         """Test upserting empty list of points."""
         with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
@@ -237,6 +342,91 @@ class TestQdrantStore:
                     points_selector=point_ids
                 )
     
+    def test_delete_by_files_single_request(self):
+        """Test bulk file deletion issues one filter-based delete."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client.count.return_value = MagicMock(count=7)
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                result = store.delete_by_files("test_collection", ["/p/a.py", "/p/b.py"])
+                
+                assert result.success
+                assert result.items_processed == 7
+                mock_client.delete.assert_called_once()
+                selector = mock_client.delete.call_args.kwargs["points_selector"]
+                conditions = selector.filter.should
+                assert {c.key for c in conditions} == {"file_path", "entity_name"}
+                assert all(c.match.any == ["/p/a.py", "/p/b.py"] for c in conditions)
+    
+    def test_delete_by_files_batches_large_deletions(self):
+        """Test bulk file deletion splits long path lists into capped filters."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client.count.return_value = MagicMock(count=2)
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                store.DELETE_BATCH_SIZE = 2
+                paths = [f"/p/{i}.py" for i in range(5)]
+                result = store.delete_by_files("test_collection", paths)
+                
+                assert result.success
+                assert result.items_processed == 6
+                assert mock_client.delete.call_count == 3
+                batches = [c.kwargs["points_selector"].filter.should[0].match.any
+                           for c in mock_client.delete.call_args_list]
+                assert batches == [paths[0:2], paths[2:4], paths[4:]]
+    
+    def test_delete_by_files_empty_input(self):
+        """Test bulk file deletion with no paths never reaches Qdrant."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                result = store.delete_by_files("test_collection", iter([]))
+                
+                assert result.success
+                assert result.items_processed == 0
+                mock_client.count.assert_not_called()
+                mock_client.delete.assert_not_called()
+    
+    def test_delete_by_files_nothing_matched(self):
+        """Test bulk file deletion skips the delete when no points match."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client.count.return_value = MagicMock(count=0)
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                result = store.delete_by_files("test_collection", ["/p/gone.py"])
+                
+                assert result.success
+                assert result.items_processed == 0
+                mock_client.delete.assert_not_called()
+    
+    def test_count_metadata_and_exact(self):
+        """Test count reads collection metadata unless an exact count is requested."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client.get_collection.return_value = MagicMock(points_count=7)
+                mock_client.count.return_value = MagicMock(count=5)
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                
+                assert store.count("test_collection") == 7
+                mock_client.count.assert_not_called()
+                assert store.count("test_collection", exact=True) == 5
+                mock_client.count.assert_called_once_with(collection_name="test_collection", exact=True)
+    
     def test_search_similar_success(self):
         """Test successful similarity search."""
         with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
@@ -299,6 +489,44 @@ class TestQdrantStore:
                 call_args = mock_client.search.call_args
                 assert call_args.kwargs["query_filter"] is not None
     
+    def test_search_payload_projection(self):
+        """Test legacy search forwards payload_fields as the payload projection."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_client.search.return_value = []
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                vector = np.random.rand(1536).astype(np.float32)
+                
+                store.search("test_collection", vector, top_k=5)
+                assert mock_client.search.call_args.kwargs["with_payload"] is True
+                
+                store.search("test_collection", vector, top_k=5, payload_fields=["file_path"])
+                assert mock_client.search.call_args.kwargs["with_payload"] == ["file_path"]
+    
+    def test_search_batch_single_request(self):
+        """Test batched search sends all queries in one call and keeps their order."""
+        with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):
+            with patch('claude_indexer.storage.qdrant.QdrantClient') as mock_client_class:
+                mock_client = MagicMock()
+                mock_hit = MagicMock(id="result_1", score=0.9, payload={"entity_name": "foo"})
+                mock_client.search_batch.return_value = [[mock_hit], []]
+                mock_client_class.return_value = mock_client
+                
+                store = QdrantStore()
+                vectors = [np.random.rand(1536).astype(np.float32) for _ in range(2)]
+                
+                batched = store.search_batch("test_collection", vectors, top_k=5)
+                
+                mock_client.search_batch.assert_called_once()
+                requests = mock_client.search_batch.call_args.kwargs["requests"]
+                assert [r.limit for r in requests] == [5, 5]
+                assert len(batched) == 2
+                assert batched[0][0].payload["entity_name"] == "foo"
+                assert batched[1] == []
+    
     def test_get_collection_info_success(self):
         """Test getting collection information."""
         with patch('claude_indexer.storage.qdrant.QDRANT_AVAILABLE', True):